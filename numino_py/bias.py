@@ -1,62 +1,188 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import List, Optional, Sequence
+from enum import IntEnum
+from typing import Dict, List, Optional, Sequence, Tuple
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
 import random
 import math
 
 BiasMode = str  # "SMALL" | "BALANCED" | "BIG" | "UNIFORM"
 
 
-def _weighted_choice(rng: random.Random, items: List[int], weights: List[float]) -> int:
-    total = sum(weights)
-    r = rng.random() * total
-    acc = 0.0
-    for item, w in zip(items, weights):
-        acc += w
-        if r <= acc:
-            return item
-    return items[-1]
+class _Mode(IntEnum):
+    SMALL = 0
+    BALANCED = 1
+    BIG = 2
+    UNIFORM = 3
 
 
-def _base_weights(fits: List[int], mode: BiasMode) -> List[float]:
+def _parse_mode(mode: BiasMode) -> _Mode:
+    # Unknown labels behave like BALANCED, as before
+    return _Mode.__members__.get(mode.upper(), _Mode.BALANCED)
+
+# (fits, cumulative steered weights, alias table or None for the CDF fallback)
+_SteerTable = Tuple[List[int], List[float], Optional[Tuple[List[float], List[int]]]]
+
+
+def _cdf(weights: Sequence[float]) -> List[float]:
+    """
+    Cumulative weights from correctly rounded (fsum) prefix sums: monotone,
+    and cdf[-1] is exactly the total, so any draw in [0, total] hits an item.
+    """
+    return [math.fsum(weights[:i + 1]) for i in range(len(weights))]
+
+
+def _weighted_choice_cdf(rng: random.Random, items: List[int], cdf: List[float]) -> int:
+    # First item with r <= cdf[i]; r <= cdf[-1] always, so no fallback is needed
+    r = rng.random() * cdf[-1]
+    return items[bisect_left(cdf, r)]
+
+
+def build_alias(weights: Sequence[float]) -> Tuple[List[float], List[int]]:
+    """
+    Walker–Vose alias table for O(1) weighted sampling.
+    Returns (q, A): column i yields itself with probability q[i], else A[i].
+    """
+    k = len(weights)
+    total = math.fsum(weights)
+    q = [k * w / total for w in weights]
+    A = list(range(k))
+
+    small = [i for i, x in enumerate(q) if x < 1.0]
+    large = [i for i, x in enumerate(q) if x >= 1.0]
+    while small and large:
+        s = small.pop()
+        l = large.pop()
+        A[s] = l
+        q[l] = (q[l] + q[s]) - 1.0
+        if q[l] < 1.0:
+            small.append(l)
+        else:
+            large.append(l)
+
+    # Leftovers are 1.0 up to rounding error
+    for i in large + small:
+        q[i] = 1.0
+    return q, A
+
+
+def _alias_choice(rng: random.Random, items: List[int], q: List[float], A: List[int]) -> int:
+    # One uniform draw covers both steps: the integer part picks the column,
+    # the fractional part is the biased coin (k <= 9, so precision is ample).
+    u = rng.random() * len(items)
+    i = int(u)
+    return items[i] if (u - i) < q[i] else items[A[i]]
+
+
+@lru_cache(maxsize=None)
+def _base_weights(fits: Tuple[int, ...], mode: _Mode) -> Tuple[float, ...]:
     """
     Local preference curve (kept mild).
     Global behavior is controlled separately via block-count steering.
     """
-    mode = mode.upper()
-
-    if mode == "UNIFORM":
-        return [1.0 for _ in fits]
+    if mode == _Mode.UNIFORM:
+        return tuple(1.0 for _ in fits)
 
-    if mode == "SMALL":
-        return [1.0 / (n ** 1.1) for n in fits]
+    if mode == _Mode.SMALL:
+        return tuple(1.0 / (n ** 1.1) for n in fits)
 
-    if mode == "BIG":
-        return [float(n ** 1.6) for n in fits]
+    if mode == _Mode.BIG:
+        return tuple(float(n ** 1.6) for n in fits)
 
     # BALANCED
-    return [float(n ** 0.5) for n in fits]
+    return tuple(float(n ** 0.5) for n in fits)
 
 
-def _target_block_count(area: int, nums: List[int], mode: BiasMode) -> float:
+@lru_cache(maxsize=None)
+def _reachable_sums(limit: int, nums: Tuple[int, ...]) -> int:
     """
-    Define a soft target for number of blocks.
-    This is what the player actually perceives as bias.
+    Bitmask with bit i set iff 0 <= i <= limit can be written as a sum of
+    `nums` (repetition allowed). Coin-change reachability via int shifts.
     """
-    n_min = min(nums)
-    n_max = max(nums)
-    n_mean = sum(nums) / len(nums)
-
-    mode = mode.upper()
-    if mode == "SMALL":
-        return area / n_min
-    if mode == "BIG":
-        return area / n_max
-    if mode == "UNIFORM":
-        return area / n_mean
+    full = (1 << (limit + 1)) - 1
+    reach = 1
+    while True:
+        nxt = reach
+        for n in nums:
+            nxt |= reach << n
+        nxt &= full
+        if nxt == reach:
+            return reach
+        reach = nxt
 
-    # BALANCED
-    return area / n_mean
+
+def _steer_table(fits: List[int], steer: List[float]) -> _SteerTable:
+    """
+    Sampling table for `fits` with already-steered weights.
+    """
+    # Tiny alphabets don't pay for the alias table; bisect the CDF instead
+    if len(fits) > 2:
+        return fits, [], build_alias(steer)
+    if len(fits) == 1:
+        return fits, [], None
+    return fits, _cdf(steer), None
+
+
+def _fill_blocks(
+    rng: random.Random,
+    blocks: List[int],
+    remaining: int,
+    nums: List[int],
+    steer_more: List[float],
+    steer_fewer: List[float],
+    target_blocks: float,
+    tables: Dict[Tuple[int, bool], _SteerTable],
+    reachable: int,
+) -> int:
+    """
+    Inner pick loop of one try: appends picks to `blocks` until `remaining`
+    is used up. Only sizes that leave a remainder still reachable as a sum
+    of `nums` are offered, so a try that starts reachable never dead-ends.
+    Returns the leftover (0 on success).
+
+    `nums` is sorted, so the candidates lie in the prefix nums[:k]; a state
+    is fully described by (bitmask of reachable indices, more_blocks).
+    """
+    append = blocks.append
+    get_table = tables.get
+
+    # Every size is >= 1, so a try needs at most `remaining` picks
+    guard = remaining
+    while remaining > 0 and guard > 0:
+        guard -= 1
+        k = bisect_right(nums, remaining)
+
+        fit_bits = 0
+        for j in range(k):
+            if (reachable >> (remaining - nums[j])) & 1:
+                fit_bits |= 1 << j
+        if not fit_bits:
+            break
+
+        # ---- Global steering toward target block count ----
+        more_blocks = (target_blocks - len(blocks)) > 0
+
+        key = (fit_bits, more_blocks)
+        table = get_table(key)
+        if table is None:
+            idx = [j for j in range(k) if (fit_bits >> j) & 1]
+            steer = steer_more if more_blocks else steer_fewer
+            table = _steer_table([nums[j] for j in idx], [steer[j] for j in idx])
+            tables[key] = table
+
+        fits, cdf, alias = table
+        if alias is not None:
+            pick = _alias_choice(rng, fits, alias[0], alias[1])
+        elif cdf:
+            pick = _weighted_choice_cdf(rng, fits, cdf)
+        else:
+            # Only one size fits: the pick is forced, no draw needed
+            pick = fits[0]
+        append(pick)
+        remaining -= pick
+
+    return remaining
 
 
 def choose_block_sizes_biased(
@@ -82,47 +208,51 @@ def choose_block_sizes_biased(
     if require_all_numbers and sum(nums) > area:
         return None
 
+    mode_id = _parse_mode(mode)
+
+    # Steered weights depend only on `fits` and the sign of delta (mode and
+    # nums are fixed per call), so each sampling table is built once and
+    # reused across picks and tries.
+    tables: Dict[Tuple[int, bool], _SteerTable] = {}
+
+    # Base local weights, pre-steered for both directions (loop invariant).
+    # If we want MORE blocks, favor smaller sizes.
+    # If we want FEWER blocks, favor larger sizes.
+    n_min, n_max = nums[0], nums[-1]
+    base_w = _base_weights(tuple(nums), mode_id)
+    steer_more = [w * (n_max / n) ** 0.6 for n, w in zip(nums, base_w)]
+    steer_fewer = [w * (n / n_min) ** 0.6 for n, w in zip(nums, base_w)]
+
+    # Soft target for number of blocks: this is what the player actually
+    # perceives as bias. Only the aggregate the mode needs is computed.
+    if mode_id == _Mode.SMALL:
+        target_blocks = area / n_min
+    elif mode_id == _Mode.BIG:
+        target_blocks = area / n_max
+    else:
+        # BALANCED / UNIFORM
+        target_blocks = area * len(nums) / sum(nums)
+
+    # Seed with one of each number if required
+    blocks: List[int] = list(nums) if require_all_numbers else []
+    n_seed = len(blocks)
+    seed_remaining = area - sum(blocks)
+
+    # If the seeded remainder can't be filled at all, no try can succeed
+    reachable = _reachable_sums(seed_remaining, tuple(nums))
+    if not (reachable >> seed_remaining) & 1:
+        return None
+
     for _ in range(max_tries):
-        remaining = area
-        blocks: List[int] = []
-
-        # Seed with one of each number if required
-        if require_all_numbers:
-            blocks.extend(nums)
-            remaining -= sum(nums)
-
-        target_blocks = _target_block_count(area, nums, mode)
-
-        guard = 10000
-        while remaining > 0 and guard > 0:
-            guard -= 1
-            fits = [n for n in nums if n <= remaining]
-            if not fits:
-                break
-
-            # Base local weights
-            w = _base_weights(fits, mode)
-
-            # ---- Global steering toward target block count ----
-            current_blocks = len(blocks)
-            delta = target_blocks - current_blocks
-
-            # If we want MORE blocks, favor smaller sizes.
-            # If we want FEWER blocks, favor larger sizes.
-            steer = []
-            for n, weight in zip(fits, w):
-                if delta > 0:
-                    factor = (max(nums) / n) ** 0.6
-                else:
-                    factor = (n / min(nums)) ** 0.6
-                steer.append(weight * factor)
-
-            pick = _weighted_choice(rng, fits, steer)
-            blocks.append(pick)
-            remaining -= pick
+        # One buffer for all tries: drop the previous try's picks, keep the seed
+        del blocks[n_seed:]
+
+        remaining = _fill_blocks(
+            rng, blocks, seed_remaining, nums, steer_more, steer_fewer, target_blocks, tables, reachable
+        )
 
         if remaining == 0:
             rng.shuffle(blocks)
             return blocks
 
-    return None
\ No newline at end of file
+    return None
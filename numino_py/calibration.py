@@ -1,7 +1,9 @@
 import tkinter as tk
+from tkinter import font as tkfont
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import List, Set, Dict, Callable, Optional, Tuple
-from datetime import datetime
+import time
 
 
 # =========================
@@ -9,6 +11,7 @@ from datetime import datetime
 # Codes: B,R,Y,V,P,G  (V=green, G=gray)
 # =========================
 COLOR_ORDER = ["B", "R", "Y", "V", "P", "G"]
+COLOR_BIT = {code: 1 << i for i, code in enumerate(COLOR_ORDER)}
 COLOR_HEX = {
     "B": "#6f8ea8",  # blue-gray
     "R": "#b96b5f",  # muted red
@@ -26,12 +29,17 @@ GLOBAL_MAX_COLORS = 6
 
 
 def default_seed_timestamp_seconds() -> int:
-    return int(datetime.now().strftime("%Y%m%d%H%M%S"))
+    """Local time as a YYYYMMDDHHMMSS integer (built arithmetically, no string round trip)."""
+    t = time.localtime()
+    ymd = (t.tm_year * 100 + t.tm_mon) * 100 + t.tm_mday
+    return ((ymd * 100 + t.tm_hour) * 100 + t.tm_min) * 100 + t.tm_sec
 
 
 # =========================
 # Cascading rules
+# (pure functions over a tiny domain; memoized since every click re-runs them)
 # =========================
+@lru_cache(maxsize=None)
 def max_number_allowed(rows: int, cols: int) -> int:
     """
     Simple rule:
@@ -47,6 +55,7 @@ def max_number_allowed(rows: int, cols: int) -> int:
     return 7
 
 
+@lru_cache(maxsize=None)
 def max_distinct_numbers_allowed(A: int) -> int:
     if A <= 9:
         return 2
@@ -59,6 +68,7 @@ def max_distinct_numbers_allowed(A: int) -> int:
     return 7
 
 
+@lru_cache(maxsize=None)
 def max_colors_allowed(A: int, min_dim: int) -> int:
     """
     Relaxed area-based unlocks for max selectable colors:
@@ -80,13 +90,17 @@ def max_colors_allowed(A: int, min_dim: int) -> int:
     return min(GLOBAL_MAX_COLORS, 6)
 
 
-def balance_availability(rows: int, cols: int, nums: List[int]) -> Dict[str, bool]:
+@lru_cache(maxsize=None)
+def balance_availability(rows: int, cols: int, nums: Tuple[int, ...]) -> Dict[str, bool]:
     """
     Relaxed bias rules:
       - BALANCED is always available (handled in UI).
       - SMALL enabled if: n_min <= 2 AND range >= 2
       - BIG enabled if: n_max >= 4 AND area >= 16 AND range >= 2
       - If range < 2 => both SMALL and BIG disabled (Balanced-only feel).
+
+    `nums` is a tuple so results can be cached; the returned dict is shared,
+    treat it as read-only.
     """
     A = rows * cols
     if not nums:
@@ -120,6 +134,19 @@ class CalibrationResult:
 # =========================
 # UI Widgets
 # =========================
+def _get_fonts(root: tk.Misc) -> Dict[str, tkfont.Font]:
+    """
+    Shared Font objects for the calibrator, parsed once instead of per widget.
+    Fonts belong to a Tk root, so call this after the root exists and keep
+    the result on the UI instance.
+    """
+    return {
+        "circle": tkfont.Font(root=root, family="Helvetica", size=16, weight="bold"),
+        "swatch": tkfont.Font(root=root, family="Helvetica", size=18, weight="bold"),
+        "balance": tkfont.Font(root=root, family="Helvetica", size=12, weight="bold"),
+    }
+
+
 class CircleButton(tk.Canvas):
     """
     Three states:
@@ -127,14 +154,22 @@ class CircleButton(tk.Canvas):
       - available: outline circle with dark text
       - disabled: outline with X
     """
-    def __init__(self, master, label: str, on_click: Callable[[], None], size=46):
+    def __init__(self, master, label: str, on_click: Callable[[], None], size=46, font=None):
         super().__init__(master, width=size, height=size, highlightthickness=0, bg=master["bg"])
         self.size = size
         self.label = label
         self.on_click = on_click
 
+        # Items are created once; _draw only reconfigures them
+        pad = 5
+        r = size - pad
+        cx = cy = size / 2
+        self._oval = self.create_oval(pad, pad, r, r, width=2)
+        self._text = self.create_text(cx, cy, font=font or ("Helvetica", 16, "bold"))
+
         self.enabled = True
         self.selected = False
+        self._prev_state = None
         self._draw()
 
         self.bind("<Button-1>", self._click)
@@ -145,29 +180,28 @@ class CircleButton(tk.Canvas):
         self.on_click()
 
     def set_state(self, enabled: bool, selected: bool, show_x: bool = False):
+        # Skip the redraw when nothing visible changed
+        if (enabled, selected, show_x) == self._prev_state:
+            return
+        self._prev_state = (enabled, selected, show_x)
         self.enabled = enabled
         self.selected = selected
         self.show_x = show_x
         self._draw()
 
     def _draw(self):
-        self.delete("all")
-        pad = 5
-        r = self.size - pad
-        cx = cy = self.size / 2
-
         if not getattr(self, "enabled", True):
             # disabled
-            self.create_oval(pad, pad, r, r, outline="#aaaaaa", width=2)
-            self.create_text(cx, cy, text="X", fill="#888888", font=("Helvetica", 16, "bold"))
+            self.itemconfig(self._oval, outline="#aaaaaa", fill="")
+            self.itemconfig(self._text, text="X", fill="#888888")
             return
 
         if getattr(self, "selected", False):
-            self.create_oval(pad, pad, r, r, outline="#555555", width=2, fill="#666666")
-            self.create_text(cx, cy, text=self.label, fill="#ffffff", font=("Helvetica", 16, "bold"))
+            self.itemconfig(self._oval, outline="#555555", fill="#666666")
+            self.itemconfig(self._text, text=self.label, fill="#ffffff")
         else:
-            self.create_oval(pad, pad, r, r, outline="#888888", width=2, fill="#ffffff")
-            self.create_text(cx, cy, text=self.label, fill="#444444", font=("Helvetica", 16, "bold"))
+            self.itemconfig(self._oval, outline="#888888", fill="#ffffff")
+            self.itemconfig(self._text, text=self.label, fill="#444444")
 
 
 class ColorSwatch(tk.Canvas):
@@ -177,14 +211,25 @@ class ColorSwatch(tk.Canvas):
       - available: no shadow
       - disabled: swatch with X overlay
     """
-    def __init__(self, master, code: str, on_click: Callable[[], None], size=46):
+    def __init__(self, master, code: str, on_click: Callable[[], None], size=46, font=None):
         super().__init__(master, width=size, height=size, highlightthickness=0, bg=master["bg"])
         self.size = size
         self.code = code
         self.on_click = on_click
 
+        # Items are created once (shadow and X start hidden); _draw toggles them
+        s = size
+        self._shadow = self.create_rectangle(
+            6, 34, s-6, s-6, fill="#000000", outline="", stipple="gray50", state="hidden"
+        )
+        self._square = self.create_rectangle(6, 6, s-6, s-6, fill=COLOR_HEX[code], outline="#ffffff", width=1)
+        self._x = self.create_text(
+            s/2, s/2, text="X", fill="#ffffff", font=font or ("Helvetica", 18, "bold"), state="hidden"
+        )
+
         self.enabled = True
         self.selected = False
+        self._prev_state = None
         self._draw()
 
         self.bind("<Button-1>", self._click)
@@ -195,25 +240,19 @@ class ColorSwatch(tk.Canvas):
         self.on_click()
 
     def set_state(self, enabled: bool, selected: bool):
+        if (enabled, selected) == self._prev_state:
+            return
+        self._prev_state = (enabled, selected)
         self.enabled = enabled
         self.selected = selected
         self._draw()
 
     def _draw(self):
-        self.delete("all")
-        s = self.size
-        col = COLOR_HEX[self.code]
-
         # Shadow if selected
-        if self.enabled and self.selected:
-            self.create_rectangle(6, 34, s-6, s-6, fill="#000000", outline="", stipple="gray50")
-
-        # Main square
-        self.create_rectangle(6, 6, s-6, s-6, fill=col, outline="#ffffff", width=1)
+        self.itemconfig(self._shadow, state=("normal" if self.enabled and self.selected else "hidden"))
 
-        if not self.enabled:
-            cx = cy = s/2
-            self.create_text(cx, cy, text="X", fill="#ffffff", font=("Helvetica", 18, "bold"))
+        # X overlay if disabled
+        self.itemconfig(self._x, state=("hidden" if self.enabled else "normal"))
 
 
 # --- BalanceCircle widget ---
@@ -224,13 +263,20 @@ class BalanceCircle(tk.Canvas):
       - available: white circle with gray outline + gray label
       - disabled: white circle with light gray outline + light gray label
     """
-    def __init__(self, master, label: str, on_click: Callable[[], None], size: int = 86):
+    def __init__(self, master, label: str, on_click: Callable[[], None], size: int = 86, font=None):
         super().__init__(master, width=size, height=size, highlightthickness=0, bg=master["bg"])
         self.size = size
         self.label = label
         self.on_click = on_click
+
+        # Items are created once; _draw only reconfigures them
+        pad = 10
+        self._oval = self.create_oval(pad, pad, size - pad, size - pad, width=2)
+        self._text = self.create_text(size / 2, size / 2, text=label, font=font or ("Helvetica", 12, "bold"))
+
         self.enabled = True
         self.selected = False
+        self._prev_state = None
         self._draw()
         self.bind("<Button-1>", self._click)
 
@@ -240,17 +286,14 @@ class BalanceCircle(tk.Canvas):
         self.on_click()
 
     def set_state(self, enabled: bool, selected: bool):
+        if (enabled, selected) == self._prev_state:
+            return
+        self._prev_state = (enabled, selected)
         self.enabled = enabled
         self.selected = selected
         self._draw()
 
     def _draw(self):
-        self.delete("all")
-        s = self.size
-        pad = 10
-        x0, y0, x1, y1 = pad, pad, s - pad, s - pad
-        cx, cy = s / 2, s / 2
-
         if not self.enabled:
             outline = "#cccccc"
             fill = "#ffffff"
@@ -264,8 +307,8 @@ class BalanceCircle(tk.Canvas):
             fill = "#ffffff"
             textc = "#666666"
 
-        self.create_oval(x0, y0, x1, y1, outline=outline, width=2, fill=fill)
-        self.create_text(cx, cy, text=self.label, fill=textc, font=("Helvetica", 12, "bold"))
+        self.itemconfig(self._oval, outline=outline, fill=fill)
+        self.itemconfig(self._text, fill=textc)
 
 
 class BalanceIcon(tk.Canvas):
@@ -275,14 +318,20 @@ class BalanceIcon(tk.Canvas):
       - available: outline
       - disabled: faded
     """
-    def __init__(self, master, label: str, on_click: Callable[[], None], size=64):
+    def __init__(self, master, label: str, on_click: Callable[[], None], size=64, font=None):
         super().__init__(master, width=size, height=size, highlightthickness=0, bg=master["bg"])
         self.size = size
         self.label = label
         self.on_click = on_click
 
+        # Items are created once; _draw only reconfigures them
+        s = size
+        self._oval = self.create_oval(10, 10, s-10, s-10, width=2)
+        self._text = self.create_text(s/2, s/2, text=label[0], font=font or ("Helvetica", 18, "bold"))
+
         self.enabled = True
         self.selected = False
+        self._prev_state = None
         self._draw()
         self.bind("<Button-1>", self._click)
 
@@ -292,26 +341,25 @@ class BalanceIcon(tk.Canvas):
         self.on_click()
 
     def set_state(self, enabled: bool, selected: bool):
+        if (enabled, selected) == self._prev_state:
+            return
+        self._prev_state = (enabled, selected)
         self.enabled = enabled
         self.selected = selected
         self._draw()
 
     def _draw(self):
-        self.delete("all")
-        s = self.size
-        cx = cy = s/2
-
         if not self.enabled:
-            self.create_oval(10, 10, s-10, s-10, outline="#777777", width=2)
-            self.create_text(cx, cy, text=self.label[0], fill="#777777", font=("Helvetica", 18, "bold"))
+            self.itemconfig(self._oval, outline="#777777", fill="")
+            self.itemconfig(self._text, fill="#777777")
             return
 
         if self.selected:
-            self.create_oval(10, 10, s-10, s-10, outline="#ffffff", width=2, fill="#666666")
-            self.create_text(cx, cy, text=self.label[0], fill="#ffffff", font=("Helvetica", 18, "bold"))
+            self.itemconfig(self._oval, outline="#ffffff", fill="#666666")
+            self.itemconfig(self._text, fill="#ffffff")
         else:
-            self.create_oval(10, 10, s-10, s-10, outline="#cccccc", width=2)
-            self.create_text(cx, cy, text=self.label[0], fill="#cccccc", font=("Helvetica", 18, "bold"))
+            self.itemconfig(self._oval, outline="#cccccc", fill="")
+            self.itemconfig(self._text, fill="#cccccc")
 
 
 # =========================
@@ -324,6 +372,7 @@ class CalibrationUI(tk.Tk):
         self.title("Numino — Calibrate")
 
         self.on_start = on_start
+        self._fonts = _get_fonts(self)
 
         self.rows = 5
         self.cols = 5
@@ -348,11 +397,21 @@ class CalibrationUI(tk.Tk):
         self.color_btns: Dict[str, ColorSwatch] = {}
         self.balance_btns: Dict[str, BalanceCircle] = {}
 
+        # Flat (key, widget) lists for the render pass, filled by _build
+        self._num_list: List[Tuple[int, CircleButton]] = []
+        self._color_list: List[Tuple[int, ColorSwatch]] = []
+
         self.status = tk.Label(self, text="", bg=self["bg"], fg="#888888", font=("Helvetica", 11))
+        self._last_status = None
         self.start_btn = tk.Button(self, text="▶", font=("Helvetica", 28), command=self._start)
 
+        # Build and lay out everything while the window is unmapped, then show it
+        # once: a single geometry pass instead of one per packed widget.
+        self.withdraw()
         self._build()
         self._cascade_all()
+        self.update_idletasks()
+        self.deiconify()
 
     def _build(self):
         outer = tk.Frame(self, bg=self["bg"], padx=18, pady=18)
@@ -410,18 +469,24 @@ class CalibrationUI(tk.Tk):
         nums_row.pack(pady=(0, 18))
 
         for n in NUMBER_OPTIONS:
-            btn = CircleButton(nums_row, label=str(n), on_click=lambda nn=n: self._toggle_number(nn))
+            btn = CircleButton(
+                nums_row, label=str(n), on_click=lambda nn=n: self._toggle_number(nn), font=self._fonts["circle"]
+            )
             btn.pack(side="left", padx=6)
             self.num_btns[n] = btn
+            self._num_list.append((n, btn))
 
         # Colors row
         cols_row = tk.Frame(outer, bg=self["bg"])
         cols_row.pack(pady=(0, 22))
 
         for code in COLOR_ORDER:
-            sw = ColorSwatch(cols_row, code=code, on_click=lambda cc=code: self._toggle_color(cc))
+            sw = ColorSwatch(
+                cols_row, code=code, on_click=lambda cc=code: self._toggle_color(cc), font=self._fonts["swatch"]
+            )
             sw.pack(side="left", padx=10)
             self.color_btns[code] = sw
+            self._color_list.append((COLOR_BIT[code], sw))
 
         # Balance row (circular buttons like the mock)
         bal_row = tk.Frame(outer, bg=self["bg"])
@@ -429,7 +494,10 @@ class CalibrationUI(tk.Tk):
 
         label_map = {"SMALL": "Small", "BALANCED": "Balanced", "BIG": "Big"}
         for opt in BALANCE_OPTIONS:
-            w = BalanceCircle(bal_row, label=label_map[opt], on_click=lambda oo=opt: self._set_balance(oo), size=86)
+            w = BalanceCircle(
+                bal_row, label=label_map[opt], on_click=lambda oo=opt: self._set_balance(oo), size=86,
+                font=self._fonts["balance"],
+            )
             w.pack(side="left", padx=26)
             self.balance_btns[opt] = w
 
@@ -455,17 +523,14 @@ class CalibrationUI(tk.Tk):
         if not self.num_btns[n].enabled:
             return
 
-        A = self.rows * self.cols
-        cap = max_distinct_numbers_allowed(A)
-
         if n in self.selected_numbers:
             self.selected_numbers.remove(n)
         else:
-            if len(self.selected_numbers) >= cap:
+            if len(self.selected_numbers) >= self._cap_n:
                 return
             self.selected_numbers.add(n)
 
-        self._cascade_all()
+        self._cascade_selection()
 
     # ---- colors ----
     def _toggle_color(self, c: str):
@@ -473,19 +538,15 @@ class CalibrationUI(tk.Tk):
         if not self.color_btns[c].enabled:
             return
 
-        A = self.rows * self.cols
-        min_dim = min(self.rows, self.cols)
-        cap = max_colors_allowed(A, min_dim)
-
         if c in self.selected_colors:
             self.selected_colors.remove(c)
         else:
             # Enforce cap: require user to deselect one before selecting another.
-            if len(self.selected_colors) >= cap:
+            if len(self.selected_colors) >= self._col_cap:
                 return
             self.selected_colors.append(c)
 
-        self._cascade_all()
+        self._cascade_selection()
 
     # ---- balance ----
     def _set_balance(self, opt: str):
@@ -493,7 +554,7 @@ class CalibrationUI(tk.Tk):
         if not self.balance_btns[opt].enabled:
             return
         self.balance = opt
-        self._render_balance()
+        self._cascade_selection()
 
     # ---- cascade ----
     def _effective_numbers(self) -> List[int]:
@@ -502,59 +563,76 @@ class CalibrationUI(tk.Tk):
         return [1, 2, 3]
 
     def _cascade_all(self):
+        self._cascade_dims()
+        self._cascade_selection()
+
+    def _cascade_dims(self):
+        """
+        Rows/cols-derived limits. Only rows/cols changes can move these, so
+        they are cached here and number/color/balance clicks skip straight
+        to _cascade_selection.
+        """
         rows, cols = self.rows, self.cols
         A = rows * cols
         min_dim = min(rows, cols)
+        self._A = A
+        self._min_dim = min_dim
 
         # numbers allowed
-        maxN = max_number_allowed(rows, cols)
-        allowed_numbers = set(range(1, maxN + 1))
+        self._maxN = max_number_allowed(rows, cols)
+        # bit n set <=> number n allowed
+        self._allowed_mask = ((1 << (self._maxN + 1)) - 1) & ~1
 
         # clamp selection
-        self.selected_numbers = {n for n in self.selected_numbers if n in allowed_numbers}
+        self.selected_numbers = {n for n in self.selected_numbers if n <= self._maxN}
 
         # enforce distinct cap
-        capN = max_distinct_numbers_allowed(A)
-        if len(self.selected_numbers) > capN:
-            self.selected_numbers = set(sorted(self.selected_numbers)[:capN])
+        self._cap_n = max_distinct_numbers_allowed(A)
+        if len(self.selected_numbers) > self._cap_n:
+            self.selected_numbers = set(sorted(self.selected_numbers)[:self._cap_n])
 
         # colors cap (user may choose ANY colors, up to the cap)
-        col_cap = max_colors_allowed(A, min_dim)
+        self._col_cap = max_colors_allowed(A, min_dim)
 
         # Clamp selection to known palette codes and to cap
         self.selected_colors = [c for c in self.selected_colors if c in COLOR_ORDER]
-        if len(self.selected_colors) > col_cap:
-            self.selected_colors = self.selected_colors[:col_cap]
+        if len(self.selected_colors) > self._col_cap:
+            self.selected_colors = self.selected_colors[:self._col_cap]
+
+    def _cascade_selection(self):
+        rows, cols = self.rows, self.cols
+        A = self._A
+        col_cap = self._col_cap
+        allowed_mask = self._allowed_mask
 
         # balance availability
         nums = self._effective_numbers()
-        bal_ok = balance_availability(rows, cols, nums)
+        bal_ok = balance_availability(rows, cols, tuple(nums))
 
-        # render everything
-        for n, btn in self.num_btns.items():
-            enabled = (n in allowed_numbers)
-            selected = (n in self.selected_numbers)
-            btn.set_state(enabled=enabled, selected=selected)
+        # render everything (selection as bitmasks: one int test per widget)
+        sel_mask = 0
+        for n in self.selected_numbers:
+            sel_mask |= 1 << n
+        for n, btn in self._num_list:
+            btn.set_state(enabled=bool(allowed_mask >> n & 1), selected=bool(sel_mask >> n & 1))
 
         # Color swatches: always show all colors. If cap reached, disable unselected swatches (they show "X").
         cap_reached = (len(self.selected_colors) >= col_cap)
-        for code, sw in self.color_btns.items():
-            selected = (code in self.selected_colors)
+        col_mask = 0
+        for code in self.selected_colors:
+            col_mask |= COLOR_BIT[code]
+        for bit, sw in self._color_list:
+            selected = bool(col_mask & bit)
             enabled = selected or (not cap_reached)
             sw.set_state(enabled=enabled, selected=selected)
 
-        # Balance widgets: enable/disable + selected styling
-        self.balance_btns["BALANCED"].set_state(enabled=True, selected=(self.balance == "BALANCED"))
-        self.balance_btns["SMALL"].set_state(enabled=bal_ok["SMALL"], selected=(self.balance == "SMALL"))
-        self.balance_btns["BIG"].set_state(enabled=bal_ok["BIG"], selected=(self.balance == "BIG"))
-
-        # clamp invalid chosen balance
+        # clamp invalid chosen balance (before rendering, so each widget draws once)
         if self.balance == "SMALL" and not bal_ok["SMALL"]:
             self.balance = "BALANCED"
         if self.balance == "BIG" and not bal_ok["BIG"]:
             self.balance = "BALANCED"
 
-        # re-apply selected styling after clamping
+        # Balance widgets: enable/disable + selected styling
         self.balance_btns["BALANCED"].set_state(enabled=True, selected=(self.balance == "BALANCED"))
         self.balance_btns["SMALL"].set_state(enabled=bal_ok["SMALL"], selected=(self.balance == "SMALL"))
         self.balance_btns["BIG"].set_state(enabled=bal_ok["BIG"], selected=(self.balance == "BIG"))
@@ -570,14 +648,14 @@ class CalibrationUI(tk.Tk):
 
         self.start_btn.config(state=("normal" if start_ok else "disabled"))
 
-        # status line (debug-friendly)
-        self.status.config(
-            text=f"Area={A} | min_dim={min_dim} | maxN={maxN} | nums={sorted(self.selected_numbers)} | colors={self.selected_colors} | bias={self.balance}"
-        )
-
-    def _render_balance(self):
-        # Balance rendering handled by BalanceCircle.set_state in _cascade_all
-        return
+        # status line (debug-friendly); only reconfigure the label when its inputs changed
+        nums_sorted = sorted(self.selected_numbers)
+        key = (A, self._min_dim, self._maxN, tuple(nums_sorted), tuple(self.selected_colors), self.balance)
+        if key != self._last_status:
+            self._last_status = key
+            self.status.config(
+                text=f"Area={A} | min_dim={self._min_dim} | maxN={self._maxN} | nums={nums_sorted} | colors={self.selected_colors} | bias={self.balance}"
+            )
 
     # ---- start ----
     def _start(self):
@@ -4,12 +4,13 @@ from dataclasses import dataclass
 from typing import Dict, List, Optional, Sequence, Tuple, Set
 import random
 from collections import deque
+from functools import lru_cache
 
 from solver import Puzzle, Coord, Val
 from bias import choose_block_sizes_biased
 
 
-@dataclass
+@dataclass(slots=True)
 class ConstructConfig:
     rows: int
     cols: int
@@ -35,61 +36,82 @@ def _neighbors4(r: int, c: int, R: int, C: int) -> List[Coord]:
     return out
 
 
+@lru_cache(maxsize=None)
+def _flat_neighbors(R: int, C: int) -> Tuple[Tuple[int, ...], ...]:
+    """Row-major neighbor lists: entry r*C + c holds the flat indices of its 4-neighbors."""
+    return tuple(
+        tuple(nr * C + nc for nr, nc in _neighbors4(r, c, R, C))
+        for r in range(R) for c in range(C)
+    )
+
+
+@lru_cache(maxsize=None)
+def _neighbor_bits(R: int, C: int) -> Tuple[int, ...]:
+    """Entry r*C + c is a bitmask of the 4-neighbors of that cell (bit i = flat index i)."""
+    return tuple(sum(1 << nb for nb in nbs) for nbs in _flat_neighbors(R, C))
+
+
 def _area_feasible(rows: int, cols: int, required_numbers: Sequence[int]) -> bool:
     # If you require at least one block of each number, you need at least sum(numbers) cells.
     return rows * cols >= sum(required_numbers)
 
 
 def _find_all_shapes(
-    start: Coord,
+    start: int,
     size: int,
-    free_cells: Set[Coord],
-    R: int,
-    C: int,
+    free_bits: int,
+    nbr_bits: Sequence[int],
     limit: int,
     rng: random.Random
-) -> List[List[Coord]]:
+) -> List[List[int]]:
     """
     Generate up to `limit` connected shapes of `size` starting at `start`,
-    using randomized compact growth.
+    using randomized compact growth. Cells are flat indices; bit i of
+    `free_bits` is set for cells not yet taken by a block.
     """
-    shapes: List[List[Coord]] = []
+    shapes: List[List[int]] = []
+    rand = rng.random
+    choice = rng.choice
+    start_bit = 1 << start
+    start_touching = nbr_bits[start]
 
     for _ in range(limit):
         shape = [start]
-        used = {start}
-
-        while len(shape) < size:
-            cand: List[Coord] = []
-            seen = set()
-
-            for (r, c) in shape:
-                for nb in _neighbors4(r, c, R, C):
-                    if nb in seen:
-                        continue
-                    seen.add(nb)
-                    if nb in free_cells and nb not in used:
-                        cand.append(nb)
+        used = start_bit
+        touching = start_touching  # cells adjacent to the shape so far
+        n = 1
 
-            if not cand:
+        while n < size:
+            frontier = touching & free_bits & ~used
+            if not frontier:
                 break
 
-            # compactness bias: prefer cells that touch current shape more
-            def score(cell: Coord) -> int:
-                rr, cc = cell
-                s = 0
-                for nb in _neighbors4(rr, cc, R, C):
-                    if nb in used:
-                        s += 1
-                return s
-
-            cand.sort(key=score, reverse=True)
-            pick = cand[0] if rng.random() < 0.70 else rng.choice(cand)
-
-            used.add(pick)
+            cand: List[int] = []
+            while frontier:
+                low = frontier & -frontier
+                cand.append(low.bit_length() - 1)
+                frontier ^= low
+
+            # compactness bias: prefer cells that touch current shape more.
+            # The first best-scoring cell is the head of the stable
+            # descending sort, so only the random branch needs the sort.
+            if rand() < 0.70:
+                best = -1
+                for cell in cand:
+                    sc = (nbr_bits[cell] & used).bit_count()
+                    if sc > best:
+                        best = sc
+                        pick = cell
+            else:
+                cand.sort(key=lambda cell: (nbr_bits[cell] & used).bit_count(), reverse=True)
+                pick = choice(cand)
+
+            used |= 1 << pick
+            touching |= nbr_bits[pick]
             shape.append(pick)
+            n += 1
 
-        if len(shape) == size:
+        if n == size:
             shapes.append(shape)
 
     return shapes
@@ -100,84 +122,101 @@ def _partition_into_blocks(
     R: int,
     C: int,
     block_sizes: List[int]
-) -> Optional[Tuple[Dict[Coord, int], Dict[int, int]]]:
+) -> Optional[Tuple[List[int], Dict[int, int]]]:
     """
     Partition the grid into connected blocks with specified sizes.
     Returns:
-      - cell_to_block: (r,c) -> block_id
+      - cell_to_block: row-major list, index r*C + c -> block_id
       - block_size: block_id -> size
     """
-    all_cells: Set[Coord] = {(r, c) for r in range(R) for c in range(C)}
-    cell_to_block: Dict[Coord, int] = {}
+    nbr_bits = _neighbor_bits(R, C)
+    cell_to_block: List[int] = [-1] * (R * C)
+    free_bits = (1 << (R * C)) - 1
     block_size: Dict[int, int] = {}
 
     # Place larger blocks first (usually easier)
     sizes = sorted(block_sizes, reverse=True)
 
-    def next_free_cell() -> Optional[Coord]:
-        for r in range(R):
-            for c in range(C):
-                rc = (r, c)
-                if rc not in cell_to_block:
-                    return rc
-        return None
-
-    def dfs(i: int) -> bool:
-        if i == len(sizes):
-            return True
-
-        free = all_cells - set(cell_to_block.keys())
-        start = next_free_cell()
-        if start is None:
-            return False
-
-        size = sizes[i]
-        if size > len(free):
-            return False
-
-        shapes = _find_all_shapes(start, size, free, R, C, limit=80, rng=rng)
-        if not shapes:
-            return False
-
-        rng.shuffle(shapes)
-
-        for shape in shapes:
-            block_id = i
-            for rc in shape:
-                cell_to_block[rc] = block_id
-            block_size[block_id] = size
-
-            if dfs(i + 1):
-                return True
-
-            for rc in shape:
-                del cell_to_block[rc]
+    # remaining[i] = cells still needed by blocks i.. (prune when free < it)
+    remaining = [0] * (len(sizes) + 1)
+    for i in range(len(sizes) - 1, -1, -1):
+        remaining[i] = remaining[i + 1] + sizes[i]
+
+    # Iterative DFS. Frame i holds the candidate shapes for block i and the
+    # index of the next one to try; shapes[k - 1] is the one currently placed.
+    stack: List[List] = []
+    free_count = R * C
+    descend = True
+
+    while True:
+        if descend:
+            i = len(stack)
+            if i == len(sizes):
+                return cell_to_block, block_size
+
+            shapes: List[List[int]] = []
+            if free_count >= remaining[i] and free_bits:
+                # lowest set bit = first free cell in row-major order
+                start = (free_bits & -free_bits).bit_length() - 1
+                shapes = _find_all_shapes(start, sizes[i], free_bits, nbr_bits, limit=80, rng=rng)
+                rng.shuffle(shapes)
+            stack.append([shapes, 0])
+
+        frame = stack[-1]
+        shapes, k = frame
+        block_id = len(stack) - 1
+
+        if k > 0:
+            # undo the previously placed shape
+            prev = shapes[k - 1]
+            for cell in prev:
+                cell_to_block[cell] = -1
+                free_bits |= 1 << cell
+            free_count += len(prev)
             del block_size[block_id]
 
-        return False
-
-    if not dfs(0):
-        return None
-
-    return cell_to_block, block_size
-
+        if k == len(shapes):
+            stack.pop()
+            if not stack:
+                return None
+            descend = False
+            continue
 
-def _build_block_adjacency(cell_to_block: Dict[Coord, int], R: int, C: int) -> Dict[int, Set[int]]:
-    adj: Dict[int, Set[int]] = {}
-    for (r, c), b in cell_to_block.items():
-        adj.setdefault(b, set())
-        for nb in _neighbors4(r, c, R, C):
-            b2 = cell_to_block.get(nb)
-            if b2 is None or b2 == b:
-                continue
-            adj[b].add(b2)
-            adj.setdefault(b2, set()).add(b)
+        shape = shapes[k]
+        for cell in shape:
+            cell_to_block[cell] = block_id
+            free_bits &= ~(1 << cell)
+        free_count -= len(shape)
+        block_size[block_id] = sizes[block_id]
+        frame[1] = k + 1
+        descend = True
+
+
+def _build_block_adjacency(cell_to_block: List[int], R: int, C: int) -> List[Set[int]]:
+    """adj[b] = ids of blocks sharing an edge with block b (ids are dense 0..N-1)."""
+    adj: List[Set[int]] = [set() for _ in range(max(cell_to_block) + 1)]
+    for r in range(R):
+        row = r * C
+        for c in range(C):
+            i = row + c
+            b = cell_to_block[i]
+            # Only look right and down; each shared edge is seen once
+            if c + 1 < C:
+                b2 = cell_to_block[i + 1]
+                if b2 != b:
+                    adj[b].add(b2)
+                    adj[b2].add(b)
+            if r + 1 < R:
+                b2 = cell_to_block[i + C]
+                if b2 != b:
+                    adj[b].add(b2)
+                    adj[b2].add(b)
     return adj
 
 
 def _color_blocks_backtracking(
     rng: random.Random,
-    adj: Dict[int, Set[int]],
+    adj: List[Set[int]],
     palette: List[str],
     require_all_colors: bool
 ) -> Optional[Dict[int, str]]:
@@ -185,50 +224,76 @@ def _color_blocks_backtracking(
     Graph color the blocks so adjacent blocks differ in color.
     Reuse allowed for non-adjacent blocks.
     """
-    blocks = list(adj.keys())
-    # degree heuristic
-    blocks.sort(key=lambda b: len(adj[b]), reverse=True)
-
-    color_of: Dict[int, str] = {}
-
-    def can_use(b: int, col: str) -> bool:
-        for nb in adj[b]:
-            if color_of.get(nb) == col:
-                return False
-        return True
-
-    def dfs(idx: int) -> bool:
-        if idx == len(blocks):
-            if require_all_colors:
-                return set(palette).issubset(set(color_of.values()))
-            return True
+    # Colors are palette indices; color sets are int bitmasks over them
+    k = len(palette)
+    all_bits = (1 << k) - 1
+
+    # Forward checking: banned[b] = colors already taken by a colored neighbor
+    banned: List[int] = [0] * len(adj)
+    degree: List[int] = [len(nbs) for nbs in adj]
+    uncolored: Set[int] = set(range(len(adj)))
+    color_of: Dict[int, int] = {}
+    uses = [0] * k      # colored blocks per color
+    used_bits = 0       # colors with uses > 0
+
+    def dfs() -> bool:
+        nonlocal used_bits
+        if not uncolored:
+            return not require_all_colors or used_bits == all_bits
+
+        if require_all_colors and len(uncolored) < k - used_bits.bit_count():
+            return False
 
-        b = blocks[idx]
-        cols = palette[:]
-        rng.shuffle(cols)
+        # firstfail: fewest remaining colors, ties broken by max degree
+        b = min(uncolored, key=lambda x: ((all_bits & ~banned[x]).bit_count(), -degree[x]))
+        avail = all_bits & ~banned[b]
+        order = list(range(k))
+        rng.shuffle(order)
+        cols = [ci for ci in order if (avail >> ci) & 1]
 
         # If we require all colors, try unused colors first
         if require_all_colors:
-            used = set(color_of.values())
-            cols = [c for c in cols if c not in used] + [c for c in cols if c in used]
-
-        for col in cols:
-            if can_use(b, col):
-                color_of[b] = col
-                if dfs(idx + 1):
-                    return True
-                del color_of[b]
+            cols = (
+                [ci for ci in cols if not (used_bits >> ci) & 1]
+                + [ci for ci in cols if (used_bits >> ci) & 1]
+            )
+
+        uncolored.discard(b)
+        for ci in cols:
+            bit = 1 << ci
+            color_of[b] = ci
+            uses[ci] += 1
+            used_bits |= bit
+
+            trail: List[int] = []
+            wiped = False
+            for nb in adj[b]:
+                if nb in uncolored and not banned[nb] & bit:
+                    banned[nb] |= bit
+                    trail.append(nb)
+                    if banned[nb] == all_bits:
+                        wiped = True
+            if not wiped and dfs():
+                return True
+
+            for nb in trail:
+                banned[nb] &= ~bit
+            uses[ci] -= 1
+            if not uses[ci]:
+                used_bits &= ~bit
+            del color_of[b]
+        uncolored.add(b)
         return False
 
-    return color_of if dfs(0) else None
+    if not dfs():
+        return None
+    return {b: palette[ci] for b, ci in color_of.items()}
 
 
-def _compute_sums_from_solution(sol: Dict[Coord, Val], rows: int, cols: int) -> Tuple[List[int], List[int]]:
-    row_sums = [0] * rows
-    col_sums = [0] * cols
-    for (r, c), (n, _) in sol.items():
-        row_sums[r] += n
-        col_sums[c] += n
+def _compute_sums_from_solution(nums: List[int], rows: int, cols: int) -> Tuple[List[int], List[int]]:
+    """Row and column sums of a row-major grid of numbers."""
+    row_sums = [sum(nums[r * cols:(r + 1) * cols]) for r in range(rows)]
+    col_sums = [sum(nums[c::cols]) for c in range(cols)]
     return row_sums, col_sums
 
 
@@ -293,14 +358,13 @@ def construct_solution(cfg: ConstructConfig) -> Tuple[Dict[Coord, Val], Puzzle]:
                 continue
 
         # 4) build solution dict: each cell gets (block_size, block_color)
+        nums = [block_size[b] for b in cell_to_block]
         sol: Dict[Coord, Val] = {}
-        for (r, c), b in cell_to_block.items():
-            n = block_size[b]
-            col = colors[b]
-            sol[(r, c)] = (n, col)
+        for i, b in enumerate(cell_to_block):
+            sol[divmod(i, C)] = (nums[i], colors[b])
 
         # 5) compute sums and return base puzzle
-        row_sums, col_sums = _compute_sums_from_solution(sol, R, C)
+        row_sums, col_sums = _compute_sums_from_solution(nums, R, C)
         base_puzzle = Puzzle(
             rows=R,
             cols=C,
@@ -3,18 +3,13 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple, Set
 import random
+import threading
 from collections import deque
 
-from solver import Puzzle, Given, count_solutions, Coord, Val
+from solver import Puzzle, Given, UniquenessChecker, Coord, Val
 
 
-@dataclass
-class MaskCell:
-    show_num: bool = True
-    show_col: bool = True
-
-
-@dataclass
+@dataclass(slots=True)
 class DeconstructConfig:
     seed: int
     difficulty: str = "MEDIUM"  # EASY | MEDIUM | HARD | EXPERT
@@ -68,11 +63,18 @@ class DeconstructorStepper:
         # derived stopping threshold
         self.target_reveals = difficulty_to_target_reveals(cfg.difficulty, self.rows, self.cols)
 
-        # Mask starts fully revealed
-        self.mask: List[List[MaskCell]] = [
-            [MaskCell(True, True) for _ in range(self.cols)]
-            for _ in range(self.rows)
-        ]
+        # Row-major flat layout: cell (r,c) lives at index r*cols + c
+        n_cells = self.rows * self.cols
+        self.sol_num: List[int] = [0] * n_cells
+        self.sol_col: List[str] = [""] * n_cells
+        for (r, c), (n, col) in solution.items():
+            self.sol_num[r * self.cols + c] = n
+            self.sol_col[r * self.cols + c] = col
+
+        # Mask starts fully revealed (1 = shown)
+        self.show_num = bytearray(b"\x01") * n_cells
+        self.show_col = bytearray(b"\x01") * n_cells
+        self._reveals = 2 * n_cells
 
         # Candidate list of removable (r,c,part)
         self.candidates: List[Tuple[int, int, str]] = []
@@ -94,32 +96,40 @@ class DeconstructorStepper:
         self.rng.shuffle(self.candidates)
         self.steps_done = 0
 
+        # Persistent uniqueness oracle, kept in sync with the mask
+        self.checker = UniquenessChecker(self.current_puzzle(), solution, seed=cfg.seed)
+
+        # Blocks never change during deconstruction: compute them once and
+        # track how many attributes each one has hidden so far.
+        self._blocks = self._blocks_from_solution()
+        self._cell_to_block: List[int] = [0] * n_cells
+        for b, block in enumerate(self._blocks):
+            for i in block:
+                self._cell_to_block[i] = b
+        self._block_hidden_count: List[int] = [0] * len(self._blocks)
+
+        # Removals that broke uniqueness. The mask only ever loses clues, so
+        # a rejected (cell, part) stays rejected for the rest of the run.
+        self._rejected: Set[Tuple[int, str]] = set()
+
     # ---------------- counts / puzzle build ----------------
     def reveals_count(self) -> int:
-        cnt = 0
-        for r in range(self.rows):
-            for c in range(self.cols):
-                if self.mask[r][c].show_num:
-                    cnt += 1
-                if self.mask[r][c].show_col:
-                    cnt += 1
-        return cnt
+        return self._reveals
 
     def build_givens_from_mask(self) -> List[Given]:
         givens: List[Given] = []
-        for r in range(self.rows):
-            for c in range(self.cols):
-                n, col = self.solution[(r, c)]
-                mc = self.mask[r][c]
-                if mc.show_num or mc.show_col:
-                    givens.append(
-                        Given(
-                            r=r,
-                            c=c,
-                            num=n if mc.show_num else None,
-                            col=col if mc.show_col else None
-                        )
+        show_num, show_col = self.show_num, self.show_col
+        for i in range(self.rows * self.cols):
+            if show_num[i] or show_col[i]:
+                r, c = divmod(i, self.cols)
+                givens.append(
+                    Given(
+                        r=r,
+                        c=c,
+                        num=self.sol_num[i] if show_num[i] else None,
+                        col=self.sol_col[i] if show_col[i] else None
                     )
+                )
         return givens
 
     def current_puzzle(self) -> Puzzle:
@@ -133,84 +143,121 @@ class DeconstructorStepper:
             givens=self.build_givens_from_mask()
         )
 
-    # ---------------- block utilities (quality rule) ----------------
-    def _neighbors4(self, r: int, c: int) -> List[Coord]:
-        out: List[Coord] = []
-        if r > 0: out.append((r - 1, c))
-        if r + 1 < self.rows: out.append((r + 1, c))
-        if c > 0: out.append((r, c - 1))
-        if c + 1 < self.cols: out.append((r, c + 1))
-        return out
-
-    def _blocks_from_solution(self) -> List[List[Coord]]:
-        seen: Set[Coord] = set()
-        blocks: List[List[Coord]] = []
+    # ---------------- uniqueness-preserving removal ----------------
+    def _try_hide(self, r: int, c: int, part: str) -> bool:
+        """
+        Hide one attribute of (r,c) if the puzzle stays unique; otherwise
+        leave mask and checker untouched.
+        """
+        i = r * self.cols + c
+        if (i, part) in self._rejected:
+            return False
+
+        flags = self.show_num if part == "num" else self.show_col
+        flags[i] = 0
+        self._reveals -= 1
+
+        saved = self.checker.set_cell((r, c), bool(self.show_num[i]), bool(self.show_col[i]))
+        if not self.checker.has_second_solution((r, c), part):
+            self._block_hidden_count[self._cell_to_block[i]] += 1
+            return True
+
+        # revert
+        self.checker.restore_cell((r, c), saved)
+        flags[i] = 1
+        self._reveals += 1
+        self._rejected.add((i, part))
+        return False
 
-        for r in range(self.rows):
-            for c in range(self.cols):
-                rc = (r, c)
-                if rc in seen:
-                    continue
-                v = self.solution[rc]
-                q = deque([rc])
-                seen.add(rc)
-                block = [rc]
-                while q:
-                    rr, cc = q.popleft()
-                    for nb in self._neighbors4(rr, cc):
-                        if nb in seen:
-                            continue
-                        if self.solution[nb] == v:
-                            seen.add(nb)
-                            q.append(nb)
-                            block.append(nb)
-                blocks.append(block)
+    def _set_hidden(self, r: int, c: int, part: str, hidden: bool) -> None:
+        """Flip one mask attribute and keep the reveal count and checker in sync."""
+        i = r * self.cols + c
+        flags = self.show_num if part == "num" else self.show_col
+        flags[i] = 0 if hidden else 1
+        self._reveals += -1 if hidden else 1
+        self.checker.set_cell((r, c), bool(self.show_num[i]), bool(self.show_col[i]))
+
+    def _try_hide_batch(self, batch: List[Tuple[int, int, str]]) -> List[Tuple[int, int, str]]:
+        """
+        Hide the candidates in `batch` that keep the puzzle unique and
+        return them. Same outcome as calling _try_hide on each in order
+        (clues only ever go away, so if the whole batch keeps uniqueness so
+        does every prefix), but a batch that survives costs a single
+        uniqueness check; a failing batch is bisected.
+        """
+        if len(batch) == 1:
+            r, c, part = batch[0]
+            return list(batch) if self._try_hide(r, c, part) else []
+
+        for r, c, part in batch:
+            self._set_hidden(r, c, part, True)
+        if self.checker.is_unique():
+            for r, c, _ in batch:
+                self._block_hidden_count[self._cell_to_block[r * self.cols + c]] += 1
+            return list(batch)
+
+        # revert
+        for r, c, part in reversed(batch):
+            self._set_hidden(r, c, part, False)
+
+        mid = len(batch) // 2
+        accepted = self._try_hide_batch(batch[:mid])
+        return accepted + self._try_hide_batch(batch[mid:])
+
+    # ---------------- block utilities (quality rule) ----------------
+    def _blocks_from_solution(self) -> List[List[int]]:
+        """Connected (num,col) regions of the solution, as flat cell indices."""
+        n_cells = self.rows * self.cols
+        sol_num, sol_col = self.sol_num, self.sol_col
+        nbrs = self.checker.solver.nbrs   # same flat row-major layout
+        seen = bytearray(n_cells)
+        blocks: List[List[int]] = []
+
+        for start in range(n_cells):
+            if seen[start]:
+                continue
+            n, col = sol_num[start], sol_col[start]
+            q = deque([start])
+            seen[start] = 1
+            block = [start]
+            while q:
+                cur = q.popleft()
+                for nb in nbrs[cur]:
+                    if seen[nb]:
+                        continue
+                    if sol_num[nb] == n and sol_col[nb] == col:
+                        seen[nb] = 1
+                        q.append(nb)
+                        block.append(nb)
+            blocks.append(block)
         return blocks
 
-    def _block_fully_revealed(self, block: List[Coord]) -> bool:
-        for r, c in block:
-            mc = self.mask[r][c]
-            if not (mc.show_num and mc.show_col):
-                return False
-        return True
+    def _block_fully_revealed(self, block_id: int) -> bool:
+        return self._block_hidden_count[block_id] == 0
 
-    def _try_remove_from_block(self, block: List[Coord]) -> bool:
+    def _try_remove_from_block(self, block: List[int]) -> bool:
         candidates: List[Tuple[int, int, str]] = []
-        for r, c in block:
+        for i in block:
+            r, c = divmod(i, self.cols)
             candidates.append((r, c, "num"))
             candidates.append((r, c, "col"))
         self.rng.shuffle(candidates)
 
         for r, c, part in candidates:
-            prev_num = self.mask[r][c].show_num
-            prev_col = self.mask[r][c].show_col
-
-            if part == "num" and not prev_num:
+            i = r * self.cols + c
+            if part == "num" and not self.show_num[i]:
                 continue
-            if part == "col" and not prev_col:
+            if part == "col" and not self.show_col[i]:
                 continue
 
-            if part == "num":
-                self.mask[r][c].show_num = False
-            else:
-                self.mask[r][c].show_col = False
-
-            puzzle = self.current_puzzle()
-            nsol = count_solutions(puzzle, limit=2, seed=self.cfg.seed)
-
-            if nsol == 1:
+            if self._try_hide(r, c, part):
                 return True
 
-            # revert
-            self.mask[r][c].show_num = prev_num
-            self.mask[r][c].show_col = prev_col
-
         return False
 
     def _ensure_no_fully_revealed_blocks(self) -> None:
-        blocks = self._blocks_from_solution()
-        for block in blocks:
-            if self._block_fully_revealed(block):
+        for block_id, block in enumerate(self._blocks):
+            if self._block_fully_revealed(block_id):
                 self._try_remove_from_block(block)
 
     # ---------------- removal candidate picker ----------------
@@ -218,12 +265,15 @@ class DeconstructorStepper:
         if not self.candidates:
             return None
 
+        cols = self.cols
+        show_num, show_col = self.show_num, self.show_col
+
         # Strategy filter
         for idx, (r, c, part) in enumerate(self.candidates):
-            cell = self.mask[r][c]
-            if part == "num" and not cell.show_num:
+            i = r * cols + c
+            if part == "num" and not show_num[i]:
                 continue
-            if part == "col" and not cell.show_col:
+            if part == "col" and not show_col[i]:
                 continue
 
             if self.cfg.strategy == "number_first" and part != "num":
@@ -236,11 +286,11 @@ class DeconstructorStepper:
 
         # Fallback any removable
         for idx, (r, c, part) in enumerate(self.candidates):
-            cell = self.mask[r][c]
-            if part == "num" and cell.show_num:
+            i = r * cols + c
+            if part == "num" and show_num[i]:
                 self.candidates.pop(idx)
                 return (r, c, part)
-            if part == "col" and cell.show_col:
+            if part == "col" and show_col[i]:
                 self.candidates.pop(idx)
                 return (r, c, part)
 
@@ -274,34 +324,66 @@ class DeconstructorStepper:
 
             r, c, part = cand
 
-            prev_num = self.mask[r][c].show_num
-            prev_col = self.mask[r][c].show_col
+            if self._try_hide(r, c, part):
+                self._ensure_no_fully_revealed_blocks()
+                return {"ok": True, "removed": (r, c, part), "reveals": self.reveals_count(), "reason": "unique_kept"}
 
-            if part == "num":
-                self.mask[r][c].show_num = False
-            else:
-                self.mask[r][c].show_col = False
+        self._ensure_no_fully_revealed_blocks()
+        return {"ok": False, "removed": None, "reveals": self.reveals_count(), "reason": "no_more_unique_removals"}
 
-            puzzle = self.current_puzzle()
-            nsol = count_solutions(puzzle, limit=2, seed=self.cfg.seed)
+    def step_batch(self, k: int = 8) -> Dict:
+        """
+        Like step(), but tries up to `k` removals at once: one uniqueness
+        check covers the whole batch and only a failing batch is bisected.
+        Never removes past the target. "removed" is the list of accepted
+        (r, c, part) removals.
+        """
+        if self.steps_done >= self.cfg.max_steps:
+            self._ensure_no_fully_revealed_blocks()
+            return {"ok": False, "removed": None, "reveals": self.reveals_count(), "reason": "max_steps_reached"}
 
-            if nsol == 1:
-                self._ensure_no_fully_revealed_blocks()
-                return {"ok": True, "removed": (r, c, part), "reveals": self.reveals_count(), "reason": "unique_kept"}
+        if self.reveals_count() <= self.target_reveals:
+            self._ensure_no_fully_revealed_blocks()
+            return {"ok": False, "removed": None, "reveals": self.reveals_count(), "reason": "target_reached"}
+
+        self.steps_done += 1
+
+        diff = self.cfg.difficulty.upper()
+        tries_limit = 2000 if diff == "EXPERT" else 800 if diff == "HARD" else 500
 
-            # revert
-            self.mask[r][c].show_num = prev_num
-            self.mask[r][c].show_col = prev_col
+        tries = 0
+        while tries < tries_limit and self.candidates:
+            room = min(k, self.reveals_count() - self.target_reveals, tries_limit - tries)
+            batch: List[Tuple[int, int, str]] = []
+            while len(batch) < room:
+                cand = self._pick_next_candidate()
+                if cand is None:
+                    break
+                r, c, part = cand
+                if (r * self.cols + c, part) in self._rejected:
+                    continue
+                batch.append(cand)
+            if not batch:
+                break
+
+            tries += len(batch)
+            removed = self._try_hide_batch(batch)
+            if removed:
+                self._ensure_no_fully_revealed_blocks()
+                return {"ok": True, "removed": removed, "reveals": self.reveals_count(), "reason": "unique_kept"}
 
         self._ensure_no_fully_revealed_blocks()
         return {"ok": False, "removed": None, "reveals": self.reveals_count(), "reason": "no_more_unique_removals"}
 
-    def run_to_target(self) -> Puzzle:
+    def run_to_target(self, cancel: Optional[threading.Event] = None) -> Puzzle:
         """
         Auto-deconstruct until target reached or no more safe removals.
+        If `cancel` is given and gets set, raises RuntimeError before the next batch.
         """
         while True:
-            res = self.step()
+            if cancel is not None and cancel.is_set():
+                raise RuntimeError("Deconstruction was cancelled.")
+            res = self.step_batch()
             if not res["ok"]:
                 break
         return self.current_puzzle()
\ No newline at end of file
@@ -1,6 +1,12 @@
+import queue
+import threading
 import tkinter as tk
-from dataclasses import dataclass
-from typing import Optional, List, Tuple, Dict, Callable
+import tkinter.font as tkfont
+from tkinter import ttk
+from array import array
+from contextlib import contextmanager
+from functools import partial
+from typing import Optional, List, Tuple, Dict, Callable, Iterator, Set
 
 from solver import Puzzle, Coord, Val
 from calibration import CalibrationUI, CalibrationResult
@@ -40,16 +46,22 @@ COLOR_KEY_HINT = "Colors (tap swatch; numbers can be typed 0–9)"
 
 SHOW_SOLUTION_REFERENCE = True  # set False when sharing with testers
 
+NONE = -1  # empty num/color slot in the flat state arrays
+
+# Cell label text by number; the trailing "" makes NUM_TEXT[NONE] the empty cell
+NUM_TEXT = tuple(str(n) for n in range(10)) + ("",)
+
+UNDO_DEPTH = 256  # oldest undo records are dropped beyond this
+UNDO_REC = 3  # undo log record: (cell index, old num, old color index)
+
+_UNSET = object()  # "leave this field alone" in PlayEditor._apply
+
+CELL_BINDTAG = "NuminoCell"  # shared bind tag carrying the grid's click handler
+
 
 # =========================
 # Play UI
 # =========================
-@dataclass
-class CellState:
-    num: Optional[int] = None
-    col: Optional[str] = None  # one of palette codes (e.g., "B","R","Y","V","P","G") or None
-
-
 class PlayEditor(tk.Tk):
     """
     Mobile-style interaction:
@@ -66,9 +78,17 @@ class PlayEditor(tk.Tk):
 
     def __init__(self, puzzle: Puzzle, solution: Dict[Coord, Val], bias_label: str, puzzle_id: str):
         super().__init__()
+        # Stay unmapped while widgets are built; shown once at the end of __init__
+        self.withdraw()
         self.configure(bg=BG)
         self.title("Numino — Play")
 
+        # Shared fonts: Tk resolves each once instead of parsing a spec per widget
+        self._cell_font = tkfont.Font(self, family="Helvetica", size=16, weight="bold")
+        self._sum_font = tkfont.Font(self, family="Helvetica", size=12, weight="bold")
+        # Options shared by every row/column sum label (both windows)
+        self._sum_kw = dict(width=4, height=2, font=self._sum_font, fg=SUM_TEXT, bg=BG)
+
         self.puzzle = puzzle
         self.solution = solution
         self.bias_label = bias_label  # "SMALL" / "BALANCED" / "BIG"
@@ -77,38 +97,52 @@ class PlayEditor(tk.Tk):
         self.R = puzzle.rows
         self.C = puzzle.cols
 
-        # Allowed sets from puzzle definition
-        self.allowed_numbers = set(puzzle.numbers)
-        self.allowed_colors = set(puzzle.palette)
-
-        # Givens map (r,c)->(num?, col?)
-        self.givens_map: Dict[Tuple[int, int], Tuple[Optional[int], Optional[str]]] = {}
-        for g in puzzle.givens:
-            self.givens_map[(g.r, g.c)] = (g.num, g.col)
-
-        # Locks per cell
-        self.lock_num = [[False] * self.C for _ in range(self.R)]
-        self.lock_col = [[False] * self.C for _ in range(self.R)]
-        for (r, c), (n, col) in self.givens_map.items():
+        # Allowed sets from puzzle definition (fixed for the session)
+        self.allowed_numbers = frozenset(puzzle.numbers)
+        self.allowed_colors = frozenset(puzzle.palette)
+
+        # Color code <-> index stored in the state arrays
+        self._col_codes: List[str] = PALETTE_ORDER + sorted(self.allowed_colors - set(PALETTE_ORDER))
+        self._col_idx: Dict[str, int] = {code: i for i, code in enumerate(self._col_codes)}
+        self._cell_styles = self._build_cell_styles()
+
+        # Givens (r,c)->(num?, col?); only needed here to seed locks and state
+        givens: Dict[Tuple[int, int], Tuple[Optional[int], Optional[str]]] = {
+            (g.r, g.c): (g.num, g.col) for g in puzzle.givens
+        }
+
+        # Locks per cell, row-major (index r*C + c), 1 = given.
+        # Player state starts with givens. Row-major arrays indexed r*C + c:
+        # number and color index per cell, NONE when empty.
+        self.lock_num = bytearray(self.R * self.C)
+        self.lock_col = bytearray(self.R * self.C)
+        self.nums = array("b", [NONE] * (self.R * self.C))
+        self.col_idx = array("b", [NONE] * (self.R * self.C))
+        for (r, c), (n, col) in givens.items():
+            i = r * self.C + c
             if n is not None:
-                self.lock_num[r][c] = True
+                self.lock_num[i] = 1
+                self.nums[i] = n
             if col is not None:
-                self.lock_col[r][c] = True
+                self.lock_col[i] = 1
+                self.col_idx[i] = self._col_idx[col]
 
-        # Player state starts with givens
-        self.state: List[List[CellState]] = [[CellState() for _ in range(self.C)] for _ in range(self.R)]
+        # Solution in the same layout, so checking is an array comparison
+        self._truth_nums = array("b")
+        self._truth_cols = array("b")
         for r in range(self.R):
             for c in range(self.C):
-                n, col = self.givens_map.get((r, c), (None, None))
-                self.state[r][c].num = n
-                self.state[r][c].col = col
+                n, col = solution[(r, c)]
+                self._truth_nums.append(n)
+                self._truth_cols.append(self._col_idx[col])
 
         # Undo
         self.initial_state = self._snapshot_state()
-        self.undo_stack: List[List[List[Tuple[Optional[int], Optional[str]]]]] = []
+        # Undo is a delta log of UNDO_REC-sized records, newest last
+        self.undo_log = array("h")
         # Optional checkpoint: when set, Undo cannot go earlier than this snapshot.
         # Implementation: locking saves a snapshot and clears undo history so the earliest reachable state becomes the lock.
-        self.lock_state: Optional[List[List[Tuple[Optional[int], Optional[str]]]]] = None
+        self.lock_state: Optional[bytes] = None
 
         # Selection
         self.selected_cell: Optional[Tuple[int, int]] = None
@@ -118,7 +152,15 @@ class PlayEditor(tk.Tk):
         self.active_tool_value: Optional[object] = None  # int for num, str for col, or None for clears
 
         # UI refs
-        self.cells: List[List[tk.Label]] = []
+        self.cells: List[tk.Label] = []  # row-major, index r*C + c
+        self._cell_coord: Dict[tk.Widget, Tuple[int, int]] = {}
+        self._dirty: Optional[Set[int]] = None  # set while inside _batch_updates
+        self._batch_flush = False               # outermost batch ends with update_idletasks
+        # Last (num, style key) configured on each cell label, None = never rendered
+        self._rendered: List[Optional[Tuple[int, Tuple[int, bool, bool]]]] = [None] * (self.R * self.C)
+        self._status_pending = False  # an idle _flush_status is scheduled
+        self._highlight_pending = False  # an idle _flush_highlights is scheduled
+        self._tool_relief: Dict[Tuple[str, object], str] = {}  # last relief set per tool button
         self.status_label: Optional[tk.Label] = None
         self.undo_btn: Optional[tk.Button] = None
         self.lock_btn: Optional[tk.Button] = None
@@ -128,10 +170,11 @@ class PlayEditor(tk.Tk):
         self.col_tool_btns: Dict[str, tk.Button] = {}   # palette codes + "CLEAR"
 
         self._build_ui()
-        self._render_all()
-        self._update_status()
-        self._update_undo_button()
-        self._update_tool_highlights()
+        with self._batch_updates(flush=True):
+            self._render_all()
+            self._update_status()
+            self._update_undo_button()
+            self._update_tool_highlights()
         if SHOW_SOLUTION_REFERENCE:
             self._open_solution_reference_window()
 
@@ -143,36 +186,54 @@ class PlayEditor(tk.Tk):
         self.bind_all("<Control-z>", self._on_undo)
 
         # Keyboard numbers select number tool (0 clears number)
+        self._key_handlers: Dict[str, Callable[[], None]] = {
+            str(d): partial(self._set_num_tool, d) for d in range(10)
+        }
         self.bind("<KeyPress>", self._on_keypress)
 
+        self.deiconify()
         self.focus_force()
 
     # ---------- snapshots / undo ----------
-    def _snapshot_state(self) -> List[List[Tuple[Optional[int], Optional[str]]]]:
-        snap = []
-        for r in range(self.R):
-            row = []
-            for c in range(self.C):
-                st = self.state[r][c]
-                row.append((st.num, st.col))
-            snap.append(row)
-        return snap
-
-    def _restore_snapshot(self, snap: List[List[Tuple[Optional[int], Optional[str]]]]) -> None:
-        for r in range(self.R):
-            for c in range(self.C):
-                n, col = snap[r][c]
-                self.state[r][c].num = n
-                self.state[r][c].col = col
+    # Snapshot layout: the raw bytes of `nums` followed by those of `col_idx`.
+    def _snapshot_state(self) -> bytes:
+        return self.nums.tobytes() + self.col_idx.tobytes()
+
+    def _restore_snapshot(self, snap: bytes) -> None:
+        n = len(self.nums)
+        self.nums[:] = array("b", snap[:n])
+        self.col_idx[:] = array("b", snap[n:])
+
+    def _restore_and_render(self, snap: bytes) -> None:
+        """Restore `snap`, clear the selection, and re-render only the cells that changed."""
+        old = self._snapshot_state()
+        prev = self.selected_cell
+        self._restore_snapshot(snap)
+        self.selected_cell = None
 
-    def _push_undo(self) -> None:
-        self.undo_stack.append(self._snapshot_state())
+        dirty = set()
+        if prev is not None:
+            dirty.add(prev[0] * self.C + prev[1])
+        if old != snap:
+            n = len(self.nums)
+            for i in range(n):
+                if old[i] != snap[i] or old[n + i] != snap[n + i]:
+                    dirty.add(i)
+        for i in dirty:
+            self._render_cell(*divmod(i, self.C))
+
+    def _push_undo(self, i: int) -> None:
+        """Record cell `i` as it is now, before it gets mutated."""
+        log = self.undo_log
+        log.extend((i, self.nums[i], self.col_idx[i]))
+        if len(log) > UNDO_DEPTH * UNDO_REC:
+            del log[:UNDO_REC]
         self._update_undo_button()
 
     def _update_undo_button(self) -> None:
         if self.undo_btn is None:
             return
-        self.undo_btn.config(state=("normal" if self.undo_stack else "disabled"))
+        self.undo_btn.config(state=("normal" if self.undo_log else "disabled"))
 
     def _update_lock_ui(self) -> None:
         if self.lock_btn is not None:
@@ -186,24 +247,31 @@ class PlayEditor(tk.Tk):
         if self.lock_state is None:
             self.lock_state = self._snapshot_state()
             # Clear undo history so user can only undo back to this checkpoint
-            self.undo_stack.clear()
+            del self.undo_log[:]
         else:
             # Unlock returns to normal undo behavior (still limited by available history)
             self.lock_state = None
         self._update_undo_button()
         self._update_lock_ui()
-        self._update_status()
+        self._request_status()
 
     def _on_undo(self, _event=None) -> None:
-        if not self.undo_stack:
+        log = self.undo_log
+        if not log:
             return
-        snap = self.undo_stack.pop()
-        self._restore_snapshot(snap)
-        self.selected_cell = None
-        self._render_all()
-        self._update_status()
-        self._update_undo_button()
-        self._update_lock_ui()
+        i, num, ci = log[-UNDO_REC:]
+        del log[-UNDO_REC:]
+        with self._batch_updates(flush=True):
+            self.nums[i] = num
+            self.col_idx[i] = ci
+            prev = self.selected_cell
+            self.selected_cell = None
+            if prev is not None:
+                self._render_cell(*prev)
+            self._render_cell(*divmod(i, self.C))
+            self._request_status()
+            self._update_undo_button()
+            self._update_lock_ui()
 
     # ---------- tool handling ----------
     def _set_num_tool(self, n: int) -> None:
@@ -228,52 +296,57 @@ class PlayEditor(tk.Tk):
         self._update_tool_highlights()
 
     def _update_tool_highlights(self) -> None:
-        # Number tools
-        for n, btn in self.num_tool_btns.items():
-            active = (self.active_tool_type == "num" and self.active_tool_value == n)
-            btn.config(relief=("sunken" if active else "raised"))
-
-        # Color tools
-        for code, btn in self.col_tool_btns.items():
-            active = (self.active_tool_type == "col" and self.active_tool_value == code)
-            btn.config(relief=("sunken" if active else "raised"))
+        # Coalesced like the status line: rapid tool switches flush once per idle tick
+        if not self._highlight_pending:
+            self._highlight_pending = True
+            self.after_idle(self._flush_highlights)
 
         # Also refresh status line (shows tool)
-        self._update_status()
+        self._request_status()
+
+    def _flush_highlights(self) -> None:
+        self._highlight_pending = False
+        tools = [(("num", n), btn) for n, btn in self.num_tool_btns.items()]
+        tools += [(("col", code), btn) for code, btn in self.col_tool_btns.items()]
+        active_tool = (self.active_tool_type, self.active_tool_value)
+        for tool, btn in tools:
+            relief = "sunken" if tool == active_tool else "raised"
+            # Only buttons whose relief actually changes are reconfigured
+            if self._tool_relief.get(tool) != relief:
+                btn.config(relief=relief)
+                self._tool_relief[tool] = relief
 
     # ---------- applying tools ----------
-    def _apply_tool_to_cell(self, r: int, c: int) -> None:
-        if self.active_tool_type is None:
-            return  # no tool selected; just selection highlight
+    def _apply(self, r: int, c: int, *, num: object = _UNSET, col: object = _UNSET) -> None:
+        """
+        Single mutation path for player edits. `num` is a number or NONE,
+        `col` a color index or NONE; locked or unchanged fields are dropped,
+        and one undo frame is pushed only if something actually changes.
+        """
+        i = r * self.C + c
+        if num is not _UNSET and (self.lock_num[i] or self.nums[i] == num):
+            num = _UNSET
+        if col is not _UNSET and (self.lock_col[i] or self.col_idx[i] == col):
+            col = _UNSET
+        if num is _UNSET and col is _UNSET:
+            return
 
-        st = self.state[r][c]
-        changed = False
+        self._push_undo(i)
+        if num is not _UNSET:
+            self.nums[i] = num
+        if col is not _UNSET:
+            self.col_idx[i] = col
+        self._render_cell(r, c)
+        self._request_status()
 
-        # Apply number tool
+    def _apply_tool_to_cell(self, r: int, c: int) -> None:
         if self.active_tool_type == "num":
             n = int(self.active_tool_value)
-            if self.lock_num[r][c]:
-                return
-            new_num = None if n == 0 else n
-            if st.num != new_num:
-                self._push_undo()
-                st.num = new_num
-                changed = True
-
-        # Apply color tool
+            self._apply(r, c, num=NONE if n == 0 else n)
         elif self.active_tool_type == "col":
             code = str(self.active_tool_value)
-            if self.lock_col[r][c]:
-                return
-            new_col = None if code == "CLEAR" else code
-            if st.col != new_col:
-                self._push_undo()
-                st.col = new_col
-                changed = True
-
-        if changed:
-            self._render_cell(r, c)
-            self._update_status()
+            self._apply(r, c, col=NONE if code == "CLEAR" else self._col_idx[code])
+        # no tool selected: just selection highlight
 
     # ---------- UI ----------
     def _build_ui(self) -> None:
@@ -293,7 +366,7 @@ class PlayEditor(tk.Tk):
         tk.Button(topbar, text="Reset", command=self._on_reset).pack(side="left")
 
         # Lock indicator (shows when a checkpoint is set)
-        self.lock_status_lbl = tk.Label(topbar, text="", fg=SUM_TEXT, bg=BG, font=("Helvetica", 12, "bold"))
+        self.lock_status_lbl = tk.Label(topbar, text="", fg=SUM_TEXT, bg=BG, font=self._sum_font)
         self.lock_status_lbl.pack(side="left", padx=(12, 0))
 
         # Meta info (numbers/colors/bias)
@@ -304,7 +377,7 @@ class PlayEditor(tk.Tk):
             text=f"ID: {self.puzzle_id}\nNumbers: {allowed_nums}   |   Colors: {allowed_cols}   |   Bias: {self.bias_label}",
             fg=SUM_TEXT,
             bg=BG,
-            font=("Helvetica", 12, "bold"),
+            font=self._sum_font,
             pady=6,
         )
         meta.pack()
@@ -317,48 +390,26 @@ class PlayEditor(tk.Tk):
 
         # Column sums (top)
         for c in range(self.C):
-            tk.Label(
-                frame,
-                text=str(self.puzzle.col_sums[c]),
-                width=4,
-                height=2,
-                font=("Helvetica", 12, "bold"),
-                fg=SUM_TEXT,
-                bg=BG,
-            ).grid(row=0, column=c + 1, padx=1, pady=1)
-
-        # Rows + cells
+            tk.Label(frame, text=str(self.puzzle.col_sums[c]), **self._sum_kw).grid(row=0, column=c + 1, padx=1, pady=1)
+
+        # Rows + cells. Clicks go through one class binding on CELL_BINDTAG
+        # rather than a closure and Tcl command per label.
         self.cells = []
+        self._cell_coord = {}
+        self.bind_class(CELL_BINDTAG, "<Button-1>", self._on_cell_event)
+        # Cells start empty, unselected, unlocked; _render_all fixes up the rest
+        cell_kw = dict(width=4, height=2, font=self._cell_font, **self._cell_styles[(NONE, False, False)])
         for r in range(self.R):
-            tk.Label(
-                frame,
-                text=str(self.puzzle.row_sums[r]),
-                width=4,
-                height=2,
-                font=("Helvetica", 12, "bold"),
-                fg=SUM_TEXT,
-                bg=BG,
-            ).grid(row=r + 1, column=self.C + 1, padx=1, pady=1)
-
-            row_widgets: List[tk.Label] = []
+            tk.Label(frame, text=str(self.puzzle.row_sums[r]), **self._sum_kw).grid(
+                row=r + 1, column=self.C + 1, padx=1, pady=1
+            )
+
             for c in range(self.C):
-                lbl = tk.Label(
-                    frame,
-                    text="",
-                    width=4,
-                    height=2,
-                    bg=CELL_BG_DEFAULT,
-                    fg=TEXT_BLACK,
-                    relief="solid",
-                    bd=1,
-                    font=("Helvetica", 16, "bold"),
-                    highlightthickness=1,
-                    highlightbackground=BORDER_NORMAL,
-                )
+                lbl = tk.Label(frame, text="", **cell_kw)
                 lbl.grid(row=r + 1, column=c + 1, padx=1, pady=1, sticky="nsew")
-                lbl.bind("<Button-1>", lambda e, rr=r, cc=c: self._on_cell_click(rr, cc))
-                row_widgets.append(lbl)
-            self.cells.append(row_widgets)
+                lbl.bindtags((CELL_BINDTAG,) + lbl.bindtags())
+                self._cell_coord[lbl] = (r, c)
+                self.cells.append(lbl)
 
         # Status line
         self.status_label = tk.Label(
@@ -366,7 +417,7 @@ class PlayEditor(tk.Tk):
             text="",
             padx=12,
             pady=10,
-            font=("Helvetica", 16, "bold"),
+            font=self._cell_font,
             bg=BG,
             fg=SUM_TEXT,
         )
@@ -377,7 +428,7 @@ class PlayEditor(tk.Tk):
         palette_frame.pack(pady=(10, 0), fill="x")
 
         # Numbers palette (0-9 in two rows like mock)
-        tk.Label(palette_frame, text="Numbers", fg=SUM_TEXT, bg=BG, font=("Helvetica", 12, "bold")).pack(anchor="w")
+        tk.Label(palette_frame, text="Numbers", fg=SUM_TEXT, bg=BG, font=self._sum_font).pack(anchor="w")
 
         nums_grid = tk.Frame(palette_frame, bg=BG)
         nums_grid.pack(pady=(4, 10))
@@ -401,7 +452,7 @@ class PlayEditor(tk.Tk):
                 self.num_tool_btns[n] = btn
 
         # Colors palette
-        tk.Label(palette_frame, text=COLOR_KEY_HINT, fg=SUM_TEXT, bg=BG, font=("Helvetica", 12, "bold")).pack(anchor="w")
+        tk.Label(palette_frame, text=COLOR_KEY_HINT, fg=SUM_TEXT, bg=BG, font=self._sum_font).pack(anchor="w")
 
         cols_row = tk.Frame(palette_frame, bg=BG)
         cols_row.pack(pady=(4, 4))
@@ -450,58 +501,51 @@ class PlayEditor(tk.Tk):
             ),
             fg=SUM_TEXT,
             bg=BG,
-            font=("Helvetica", 12, "bold"),
+            font=self._sum_font,
             pady=6,
             justify="center",
         )
         meta.pack()
 
-        # Grid with sums (same visual language as play UI)
-        frame = tk.Frame(outer, bg=BG)
-        frame.pack(pady=(6, 10))
+        # Grid with sums (same visual language as play UI), drawn on one
+        # Canvas: the window is read-only, so cells need no widgets.
+        # Slots are sized like the play labels (4 chars x 2 lines of the cell font).
+        cw = self._cell_font.measure("0") * 4 + 8
+        ch = self._cell_font.metrics("linespace") * 2 + 4
+        gap = 2
+        canvas = tk.Canvas(
+            outer,
+            width=(self.C + 2) * (cw + gap),
+            height=(self.R + 1) * (ch + gap),
+            bg=BG,
+            highlightthickness=0,
+        )
+        canvas.pack(pady=(6, 10))
 
-        tk.Label(frame, text="", width=4, height=2, bg=BG).grid(row=0, column=0)
+        def slot(row: int, col: int) -> Tuple[int, int, int, int]:
+            x0 = col * (cw + gap) + gap // 2
+            y0 = row * (ch + gap) + gap // 2
+            return x0, y0, x0 + cw, y0 + ch
 
-        # Column sums (top)
+        def put_text(row: int, col: int, text: str, font: tkfont.Font, fill: str) -> None:
+            x0, y0, x1, y1 = slot(row, col)
+            canvas.create_text((x0 + x1) // 2, (y0 + y1) // 2, text=text, font=font, fill=fill)
+
+        # Column sums (top); column 0 stays empty like the play grid's corner
         for c in range(self.C):
-            tk.Label(
-                frame,
-                text=str(self.puzzle.col_sums[c]),
-                width=4,
-                height=2,
-                font=("Helvetica", 12, "bold"),
-                fg=SUM_TEXT,
-                bg=BG,
-            ).grid(row=0, column=c + 1, padx=1, pady=1)
+            put_text(0, c + 1, str(self.puzzle.col_sums[c]), self._sum_font, SUM_TEXT)
 
         # Rows + solved cells + row sums (right)
         for r in range(self.R):
-            tk.Label(
-                frame,
-                text=str(self.puzzle.row_sums[r]),
-                width=4,
-                height=2,
-                font=("Helvetica", 12, "bold"),
-                fg=SUM_TEXT,
-                bg=BG,
-            ).grid(row=r + 1, column=self.C + 1, padx=1, pady=1)
+            put_text(r + 1, self.C + 1, str(self.puzzle.row_sums[r]), self._sum_font, SUM_TEXT)
 
             for c in range(self.C):
                 n, col = self.solution[(r, c)]
                 bg = CELL_BG_DEFAULT
                 if col and col in COLOR_HEX:
                     bg = COLOR_HEX[col]
-                tk.Label(
-                    frame,
-                    text=str(n),
-                    width=4,
-                    height=2,
-                    bg=bg,
-                    fg=TEXT_BLACK,
-                    relief="solid",
-                    bd=1,
-                    font=("Helvetica", 16, "bold"),
-                ).grid(row=r + 1, column=c + 1, padx=1, pady=1, sticky="nsew")
+                canvas.create_rectangle(*slot(r + 1, c + 1), fill=bg, outline=TEXT_BLACK)
+                put_text(r + 1, c + 1, str(n), self._cell_font, TEXT_BLACK)
 
         tk.Label(
             outer,
@@ -520,97 +564,131 @@ class PlayEditor(tk.Tk):
             pass
 
     # ---------- events ----------
+    def _on_cell_event(self, event: tk.Event) -> None:
+        rc = self._cell_coord.get(event.widget)
+        if rc is not None:
+            self._on_cell_click(*rc)
+
     def _on_cell_click(self, r: int, c: int) -> None:
-        # select cell
-        prev = self.selected_cell
-        self.selected_cell = (r, c)
-        if prev is not None:
-            self._render_cell(prev[0], prev[1])
-        self._render_cell(r, c)
+        # One batch: the selection repaint and the tool's edit of the same
+        # cell collapse into a single configure. No idle flush here: the
+        # status check and highlight diff stay deferred to after_idle.
+        with self._batch_updates():
+            # select cell
+            prev = self.selected_cell
+            self.selected_cell = (r, c)
+            if prev is not None:
+                self._render_cell(prev[0], prev[1])
+            self._render_cell(r, c)
 
-        # apply tool if any
-        self._apply_tool_to_cell(r, c)
+            # apply tool if any
+            self._apply_tool_to_cell(r, c)
 
     def _on_keypress(self, event: tk.Event) -> None:
-        ch = (event.char or "").strip()
-        if not ch:
-            return
-        if ch.isdigit():
-            self._set_num_tool(int(ch))  # 0 clears number
+        handler = self._key_handlers.get(event.char)
+        if handler is not None:
+            handler()
 
     def _on_delete_color(self, _event=None) -> None:
         # Treat Delete as selecting CLEAR color tool and applying if cell selected
         if self.selected_cell is None:
             return
         r, c = self.selected_cell
-        if self.lock_col[r][c]:
-            return
-        if self.state[r][c].col is None:
-            return
-        self._push_undo()
-        self.state[r][c].col = None
-        self._render_cell(r, c)
-        self._update_status()
+        self._apply(r, c, col=NONE)
 
     def _on_reset(self) -> None:
-        self._restore_snapshot(self.initial_state)
-        self.undo_stack.clear()
-        self.lock_state = None
-        self.selected_cell = None
-        self._render_all()
-        self._update_status()
-        self._update_undo_button()
-        self._update_lock_ui()
+        with self._batch_updates(flush=True):
+            self._restore_and_render(self.initial_state)
+            del self.undo_log[:]
+            self.lock_state = None
+            self._request_status()
+            self._update_undo_button()
+            self._update_lock_ui()
 
     # ---------- rendering ----------
+    def _build_cell_styles(self) -> Dict[Tuple[int, bool, bool], Dict[str, object]]:
+        """Label options for every (color index or NONE, selected, given) cell look."""
+        styles: Dict[Tuple[int, bool, bool], Dict[str, object]] = {}
+        for ci in [NONE, *range(len(self._col_codes))]:
+            bg = CELL_BG_DEFAULT if ci == NONE else COLOR_HEX.get(self._col_codes[ci], CELL_BG_DEFAULT)
+            for selected in (False, True):
+                for given in (False, True):
+                    styles[(ci, selected, given)] = dict(
+                        bg=bg,
+                        fg=TEXT_BLACK,
+                        # selection border
+                        highlightthickness=2 if selected else 1,
+                        highlightbackground=BORDER_SELECTED if selected else BORDER_NORMAL,
+                        # givens thicker border
+                        relief="solid",
+                        bd=2 if given else 1,
+                    )
+        return styles
+
+    @contextmanager
+    def _batch_updates(self, flush: bool = False) -> Iterator[None]:
+        """
+        Defer cell repaints until the end of the block: _render_cell only
+        records the cell, and each dirty cell is configured once on exit.
+        With flush=True (whole-grid changes: build, Undo, Reset) the
+        outermost exit also runs one update_idletasks(); otherwise idle
+        work such as the status check stays coalesced by Tk.
+        Nested use joins the outer batch.
+        """
+        if self._dirty is not None:
+            self._batch_flush = self._batch_flush or flush
+            yield
+            return
+        self._dirty = set()
+        self._batch_flush = flush
+        try:
+            yield
+        finally:
+            dirty, self._dirty = self._dirty, None
+            for i in dirty:
+                self._render_cell(*divmod(i, self.C))
+            if self._batch_flush:
+                self.update_idletasks()
+
     def _render_all(self) -> None:
         for r in range(self.R):
             for c in range(self.C):
                 self._render_cell(r, c)
 
     def _render_cell(self, r: int, c: int) -> None:
-        st = self.state[r][c]
-        lbl = self.cells[r][c]
-
-        bg = CELL_BG_DEFAULT
-        if st.col and st.col in COLOR_HEX:
-            bg = COLOR_HEX[st.col]
-        lbl.config(bg=bg)
-
-        lbl.config(text="" if st.num is None else str(st.num), fg=TEXT_BLACK)
-
-        # selection border
-        if self.selected_cell == (r, c):
-            lbl.config(highlightthickness=2, highlightbackground=BORDER_SELECTED)
-        else:
-            lbl.config(highlightthickness=1, highlightbackground=BORDER_NORMAL)
-
-        # givens thicker border
-        if self.lock_num[r][c] or self.lock_col[r][c]:
-            lbl.config(relief="solid", bd=2)
-        else:
-            lbl.config(relief="solid", bd=1)
+        i = r * self.C + c
+        if self._dirty is not None:
+            self._dirty.add(i)
+            return
+        num = self.nums[i]
+        key = (
+            self.col_idx[i],
+            self.selected_cell == (r, c),
+            bool(self.lock_num[i] or self.lock_col[i]),
+        )
+        # Skip the Tcl round trip when the label already shows this
+        if self._rendered[i] == (num, key):
+            return
+        self._rendered[i] = (num, key)
+        # One configure call per cell: each .config() is a separate Tcl command
+        self.cells[i].config(text=NUM_TEXT[num], **self._cell_styles[key])
 
     # ---------- status ----------
     def _is_complete(self) -> bool:
-        for r in range(self.R):
-            for c in range(self.C):
-                if self.state[r][c].num is None:
-                    return False
-                if self.state[r][c].col is None:
-                    return False
-        return True
+        return NONE not in self.nums and NONE not in self.col_idx
 
     def _is_correct(self) -> bool:
-        for r in range(self.R):
-            for c in range(self.C):
-                n_truth, col_truth = self.solution[(r, c)]
-                st = self.state[r][c]
-                if st.num != n_truth:
-                    return False
-                if st.col != col_truth:
-                    return False
-        return True
+        return self.nums == self._truth_nums and self.col_idx == self._truth_cols
+
+    def _request_status(self) -> None:
+        """Schedule one status refresh for the next idle tick; repeated requests coalesce."""
+        if not self._status_pending:
+            self._status_pending = True
+            self.after_idle(self._flush_status)
+
+    def _flush_status(self) -> None:
+        self._status_pending = False
+        self._update_status()
 
     def _update_status(self) -> None:
         # Show active tool
@@ -640,26 +718,104 @@ def launch_play_editor(puzzle: Puzzle, solution: Dict[Coord, Val], bias_label: s
 # App entry: calibration -> generate -> play
 # =========================
 def launch_app():
-    def on_start(cfg: CalibrationResult):
+    # Flat loop: each window's mainloop has returned before the next one
+    # opens, so cancelling back to calibration never nests event loops.
+    while True:
+        chosen: List[CalibrationResult] = []
+        CalibrationUI(chosen.append).mainloop()
+        if not chosen:
+            return  # calibration window closed
+        cfg = chosen[0]
         print("PUZZLE_ID:", cfg.seed, cfg.rows, cfg.cols, cfg.numbers, cfg.colors, cfg.balance)
 
-        from tkinter import messagebox
-
         try:
-            puzzle, sol, style, puzzle_id, _difficulty = generate_puzzle_from_calibration(cfg)
+            generated = _generate_with_progress(cfg)
         except RuntimeError as e:
+            from tkinter import messagebox
             messagebox.showerror("Puzzle generation failed", str(e))
             return
 
+        if generated is None:
+            continue  # cancelled: back to calibration to pick other settings
+
+        puzzle, sol, style, puzzle_id, _difficulty = generated
         launch_play_editor(puzzle, sol, bias_label=style, puzzle_id=puzzle_id)
+        return
+
 
-    CalibrationUI(on_start).mainloop()
+def _generate_with_progress(cfg: CalibrationResult) -> Optional[Tuple[Puzzle, Dict[Coord, Val], str, str, str]]:
+    """
+    Run generate_puzzle_from_calibration on a worker thread while a small
+    "Generating…" window keeps the Tk event loop alive. It is its own Tk root,
+    like the calibration and play windows: launch_app opens them one after
+    another, never two at once.
+
+    Returns the generation result, or None if the user cancelled. Errors from
+    the worker are re-raised here, on the Tk thread.
+    """
+    results: "queue.Queue[Tuple[bool, object]]" = queue.Queue()
+    cancel = threading.Event()
+
+    def work() -> None:
+        try:
+            results.put((True, generate_puzzle_from_calibration(cfg, cancel=cancel)))
+        except BaseException as e:  # handed to the Tk thread, never raised here
+            results.put((False, e))
+
+    win = tk.Tk()
+    win.title("Numino")
+    win.configure(bg=BG)
+    win.resizable(False, False)
+    box = tk.Frame(win, padx=24, pady=18, bg=BG)
+    box.pack()
+    tk.Label(box, text="Generating puzzle…", fg=SUM_TEXT, bg=BG, font=("Helvetica", 12, "bold")).pack()
+    bar = ttk.Progressbar(box, mode="indeterminate", length=220)
+    bar.pack(pady=(10, 10))
+    bar.start(15)
+
+    outcome: List[Tuple[bool, object]] = []
+
+    def on_cancel() -> None:
+        # The worker stops at its next retry or deconstruction batch; its
+        # result is dropped
+        cancel.set()
+        win.destroy()
+
+    def poll() -> None:
+        try:
+            outcome.append(results.get_nowait())
+        except queue.Empty:
+            win.after(50, poll)
+            return
+        win.destroy()
+
+    tk.Button(box, text="Cancel", command=on_cancel).pack()
+    win.protocol("WM_DELETE_WINDOW", on_cancel)
+
+    threading.Thread(target=work, daemon=True).start()
+    win.after(50, poll)
+    win.mainloop()
+
+    if not outcome:
+        return None
+    ok, value = outcome[0]
+    if not ok:
+        raise value
+    return value
 
 # =========================
 # Puzzle generation (reusable)
 # =========================
 
-def generate_puzzle_from_calibration(cfg: CalibrationResult) -> Tuple[Puzzle, Dict[Coord, Val], str, str, str]:
+def _check_cancel(cancel: Optional[threading.Event]) -> None:
+    if cancel is not None and cancel.is_set():
+        raise RuntimeError("Puzzle generation was cancelled.")
+
+
+def generate_puzzle_from_calibration(
+    cfg: CalibrationResult,
+    cancel: Optional[threading.Event] = None,
+) -> Tuple[Puzzle, Dict[Coord, Val], str, str, str]:
     """
     Runs: calibration -> constructor -> deconstructor.
 
@@ -671,6 +827,8 @@ def generate_puzzle_from_calibration(cfg: CalibrationResult) -> Tuple[Puzzle, Di
       - difficulty: difficulty label string (e.g. "HARD")
 
     Raises RuntimeError with a user-friendly message if generation fails.
+    If `cancel` is given and gets set, raises RuntimeError at the next retry
+    or deconstruction batch.
 
     NOTE: This function does not open any UI windows; it is safe to call from a CLI exporter.
     """
@@ -698,6 +856,7 @@ def generate_puzzle_from_calibration(cfg: CalibrationResult) -> Tuple[Puzzle, Di
     base_puzzle = None
     base_seed = cfg.seed
     for i in range(MAX_CONSTRUCT_TRIES):
+        _check_cancel(cancel)
         try_seed = base_seed + i
         c_cfg.seed = try_seed
         try:
@@ -727,12 +886,14 @@ def generate_puzzle_from_calibration(cfg: CalibrationResult) -> Tuple[Puzzle, Di
     # --- deconstructor retries (vary seed) ---
     puzzle = None
     for j in range(MAX_DECONSTRUCT_TRIES):
+        _check_cancel(cancel)
         try:
             d_cfg.seed = (c_cfg.seed + 1) + j
             stepper = DeconstructorStepper(base_puzzle=base_puzzle, solution=sol, cfg=d_cfg)
-            puzzle = stepper.run_to_target()
+            puzzle = stepper.run_to_target(cancel=cancel)
             break
         except RuntimeError:
+            _check_cancel(cancel)
             continue
 
     if puzzle is None:
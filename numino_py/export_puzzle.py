@@ -7,6 +7,37 @@ from typing import Dict
 from solver import Puzzle, Coord, Val
 
 
+# Tail of a file written by json.dump({..., "puzzles": [...]}, indent=2)
+_ARRAY_TAIL = b"\n  ]\n}"
+
+
+def _append_in_place(out: Path, puzzle_obj: Dict) -> bool:
+    """
+    Append `puzzle_obj` to the "puzzles" array by rewriting only the file's
+    tail, so earlier puzzles are neither parsed nor re-serialized. The output
+    is byte-identical to a full json.dump(..., indent=2).
+
+    Returns False (file untouched) if the file does not end the way
+    export_single_puzzle writes it, e.g. after hand edits.
+    """
+    with out.open("r+b") as f:
+        size = f.seek(0, 2)
+        f.seek(max(0, size - 64))
+        tail = f.read()
+        if not tail.endswith(_ARRAY_TAIL):
+            return False
+        # Last array element must be an object (an empty array is dumped as "[]")
+        if not tail[:-len(_ARRAY_TAIL)].endswith(b"}"):
+            return False
+
+        # Nested two levels deep: json.dump indents the object by 4 spaces
+        body = json.dumps(puzzle_obj, indent=2).replace("\n", "\n    ")
+        f.seek(size - len(_ARRAY_TAIL))
+        f.write(f",\n    {body}".encode("utf-8") + _ARRAY_TAIL)
+        f.truncate()
+    return True
+
+
 def export_single_puzzle(
     puzzle: Puzzle,
     solution: Dict[Coord, Val] | None,
@@ -18,7 +49,8 @@ def export_single_puzzle(
 ) -> None:
     """
     Export ONE Numino puzzle to JSON for static web play.
-    Appends the puzzle to docs/puzzles.json if it exists.
+    Appends the puzzle to docs/puzzles.json if it exists (in place, without
+    re-reading earlier puzzles, when the file is in the format written here).
     Solutions are never exported unless explicitly requested.
     """
 
@@ -66,21 +98,22 @@ def export_single_puzzle(
     out = Path(output_path)
     out.parent.mkdir(parents=True, exist_ok=True)
 
-    if out.exists():
-        with out.open("r", encoding="utf-8") as f:
-            existing = json.load(f)
-        puzzles = existing.get("puzzles", [])
-    else:
-        puzzles = []
+    if not (out.exists() and _append_in_place(out, puzzle_obj)):
+        if out.exists():
+            with out.open("r", encoding="utf-8") as f:
+                existing = json.load(f)
+            puzzles = existing.get("puzzles", [])
+        else:
+            puzzles = []
 
-    puzzles.append(puzzle_obj)
+        puzzles.append(puzzle_obj)
 
-    data = {
-        "version": 1,
-        "puzzles": puzzles,
-    }
+        data = {
+            "version": 1,
+            "puzzles": puzzles,
+        }
 
-    with out.open("w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+        with out.open("w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
 
     print(f"✓ Exported puzzle → {out.resolve()}")
\ No newline at end of file
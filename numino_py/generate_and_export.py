@@ -9,6 +9,36 @@ from editor import generate_puzzle_from_calibration
 from export_puzzle import export_single_puzzle
 
 
+# Tail of a non-empty file written by json.dump({id: {...}, ...}, indent=2)
+_OBJECT_TAIL = b"\n  }\n}"
+
+
+def _append_solution_in_place(out: Path, puzzle_id: str, entry: dict) -> bool:
+    """
+    Add `puzzle_id: entry` to the solutions object by rewriting only the
+    file's tail, so earlier solutions are neither parsed nor re-serialized.
+    The output is byte-identical to a full json.dump(..., indent=2).
+
+    Returns False (file untouched) if the file does not end the way
+    append_private_solution writes it, or already holds `puzzle_id`
+    (replacing an entry keeps its position, which needs the full rewrite).
+    """
+    key = json.dumps(puzzle_id)
+    with out.open("r+b") as f:
+        data = f.read()
+        if not data.endswith(_OBJECT_TAIL):
+            return False
+        if f"\n  {key}: ".encode("utf-8") in data:
+            return False
+
+        # Nested one level deep: json.dump indents the value by 2 spaces
+        body = json.dumps(entry, indent=2).replace("\n", "\n  ")
+        f.seek(len(data) - 2)
+        f.write(f",\n  {key}: {body}\n}}".encode("utf-8"))
+        f.truncate()
+    return True
+
+
 def append_private_solution(
     puzzle_id: str,
     solution: dict,
@@ -17,19 +47,22 @@ def append_private_solution(
     out = Path(output_path)
     out.parent.mkdir(parents=True, exist_ok=True)
 
-    if out.exists():
-        with out.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-    else:
-        data = {}
-
-    data[puzzle_id] = {
+    entry = {
         f"{r},{c}": {"num": num, "col": col}
         for (r, c), (num, col) in solution.items()
     }
 
-    with out.open("w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    if not (out.exists() and _append_solution_in_place(out, puzzle_id, entry)):
+        if out.exists():
+            with out.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+        else:
+            data = {}
+
+        data[puzzle_id] = entry
+
+        with out.open("w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
 
     print(f"✓ Private solution saved → {out}")
 
@@ -2,14 +2,12 @@ from __future__ import annotations
 
 import random
 from collections import Counter, defaultdict
-from itertools import combinations
-from typing import List, Tuple, Dict, Set
+from typing import List
 
 # Import the SAME rules used by the calibration UI
 from calibration import (
     max_number_allowed,
     max_distinct_numbers_allowed,
-    blockiness,
     max_colors_allowed,
     balance_availability,
 )
@@ -23,54 +21,51 @@ SAMPLES = 300              # how many random calibrations to test
 GRID_RANGE = range(3, 10)  # 3..9
 # --------------------------
 
-
-def pick_subset(rng: random.Random, items: List[int], k: int) -> List[int]:
-    items = list(items)
-    rng.shuffle(items)
-    return sorted(items[:k])
+GRID_LIST: List[int] = list(GRID_RANGE)
 
 
 def main():
     rng = random.Random(SEED)
 
+    # Number pools depend only on max_number_allowed, so build each once
+    allowed_by_max = {
+        maxN: list(range(1, maxN + 1))
+        for maxN in {max_number_allowed(r, c) for r in GRID_LIST for c in GRID_LIST}
+    }
+
     results = []
     stats = Counter()
     by_area = defaultdict(Counter)
 
     for _ in range(SAMPLES):
-        rows = rng.choice(list(GRID_RANGE))
-        cols = rng.choice(list(GRID_RANGE))
+        rows = rng.choice(GRID_LIST)
+        cols = rng.choice(GRID_LIST)
         A = rows * cols
+        min_dim = min(rows, cols)
 
         # Allowed numbers by grid
-        maxN = max_number_allowed(rows, cols)
-        allowed_numbers = list(range(1, maxN + 1))
+        allowed_numbers = allowed_by_max[max_number_allowed(rows, cols)]
 
         # Pick how many distinct numbers (respect cap)
         max_k = min(len(allowed_numbers), max_distinct_numbers_allowed(A))
         k = rng.randint(1, max_k)
 
-        nums = pick_subset(rng, allowed_numbers, k)
+        nums = sorted(rng.sample(allowed_numbers, k))
 
         # Enforce your Fix A rule for small grids: must include 1
         fixA_required = (A <= 16)
         fixA_ok = (not fixA_required) or (1 in nums)
 
-        # Compute blockiness metric (use selected nums)
-        B = blockiness(A, nums)
-
         # Colors cap (current rule)
-        col_cap = max_colors_allowed(A, B)
+        col_cap = max_colors_allowed(A, min_dim)
 
         # Balance availability
-        n_min, n_max = min(nums), max(nums)
-        rng_width = n_max - n_min
-        bal_ok = balance_availability(A, n_min, n_max, rng_width, B)
+        bal_ok = balance_availability(rows, cols, tuple(nums))
         small_enabled = bal_ok["SMALL"]
         big_enabled = bal_ok["BIG"]
 
         # Record
-        results.append((rows, cols, A, nums, B, col_cap, small_enabled, big_enabled, fixA_ok))
+        results.append((rows, cols, A, nums, col_cap, small_enabled, big_enabled, fixA_ok))
 
         stats["total"] += 1
         stats[f"colors_cap_{col_cap}"] += 1
@@ -96,7 +91,7 @@ def main():
 
     total = stats["total"]
     print(f"Colors cap:")
-    for cap in sorted({2,3,4}):
+    for cap in sorted({3, 4, 6}):
         if stats.get(f"colors_cap_{cap}", 0) > 0:
             print(f"  cap={cap}: {stats[f'colors_cap_{cap}']} ({pct(stats[f'colors_cap_{cap}'], total):.1f}%)")
 
@@ -112,15 +107,16 @@ def main():
     print("\n--- By Area (only areas seen) ---")
     for A in sorted(by_area.keys()):
         c = by_area[A]["count"]
-        cap2 = by_area[A].get("cap_2", 0)
         cap3 = by_area[A].get("cap_3", 0)
         cap4 = by_area[A].get("cap_4", 0)
+        cap6 = by_area[A].get("cap_6", 0)
         sm = by_area[A]["small_on"]
         bg = by_area[A]["big_on"]
         rej = by_area[A]["fixA_rej"]
         print(
-            f"A={A:2d}  n={c:3d}  cap2={cap2:3d} ({pct(cap2,c):5.1f}%)"
-            f"  cap3={cap3:3d} ({pct(cap3,c):5.1f}%)"
+            f"A={A:2d}  n={c:3d}  cap3={cap3:3d} ({pct(cap3,c):5.1f}%)"
+            f"  cap4={cap4:3d} ({pct(cap4,c):5.1f}%)"
+            f"  cap6={cap6:3d} ({pct(cap6,c):5.1f}%)"
             f"  SMALL={sm:3d} ({pct(sm,c):5.1f}%)"
             f"  BIG={bg:3d} ({pct(bg,c):5.1f}%)"
             f"  fixA_rej={rej:3d} ({pct(rej,c):5.1f}%)"
@@ -128,8 +124,8 @@ def main():
 
     # Optional: print a few random examples that look "weird"
     print("\n--- Examples (first 12) ---")
-    for (rows, cols, A, nums, B, cap, sm, bg, ok) in results[:12]:
-        print(f"{rows}x{cols} A={A:2d} nums={nums} B={B:5.1f} cap={cap} SMALL={sm} BIG={bg} fixA_ok={ok}")
+    for (rows, cols, A, nums, cap, sm, bg, ok) in results[:12]:
+        print(f"{rows}x{cols} A={A:2d} nums={nums} cap={cap} SMALL={sm} BIG={bg} fixA_ok={ok}")
 
     print("\nDone.\n")
 
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-from collections import Counter, deque
-from typing import Dict, Tuple, List
+from collections import Counter
+from typing import Dict
 from constructor import ConstructConfig, construct_solution
 from solver import Coord, Val
 
@@ -14,50 +14,35 @@ SAMPLES = 30
 SEED0 = 202501010101
 
 
-def neighbors4(r: int, c: int, R: int, C: int) -> List[Tuple[int, int]]:
-    out: List[Tuple[int, int]] = []
-    if r > 0:
-        out.append((r - 1, c))
-    if r + 1 < R:
-        out.append((r + 1, c))
-    if c > 0:
-        out.append((r, c - 1))
-    if c + 1 < C:
-        out.append((r, c + 1))
-    return out
-
-
 def block_histogram(sol: Dict[Coord, Val], rows: int, cols: int) -> Counter:
     """
     Count blocks by size in a fully constructed solution.
     We treat a block as a connected component of identical (n, color).
+    Components are labelled with a union-find over row-major cell indices:
+    one pass joins each cell to equal right/down neighbors, then every
+    root is one block.
     """
-    seen = set()
-    hist = Counter()
-
-    for r in range(rows):
-        for c in range(cols):
-            rc = (r, c)
-            if rc in seen:
-                continue
-
-            v = sol[rc]
-            n, _ = v
-            q = deque([rc])
-            seen.add(rc)
-
-            while q:
-                rr, cc = q.popleft()
-                for nb in neighbors4(rr, cc, rows, cols):
-                    if nb in seen:
-                        continue
-                    if sol[nb] == v:
-                        seen.add(nb)
-                        q.append(nb)
+    vals = [sol[(r, c)] for r in range(rows) for c in range(cols)]
+    parent = list(range(rows * cols))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, v in enumerate(vals):
+        c = i % cols
+        if c + 1 < cols and vals[i + 1] == v:
+            parent[find(i + 1)] = find(i)
+        if i + cols < len(vals) and vals[i + cols] == v:
+            parent[find(i + cols)] = find(i)
 
+    hist = Counter()
+    for i, v in enumerate(vals):
+        if parent[i] == i:
             # Each connected component corresponds to one block of size n
-            hist[n] += 1
-
+            hist[v[0]] += 1
     return hist
 
 
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from collections import deque
+from functools import lru_cache
 from typing import Dict, List, Optional, Sequence, Tuple
 import random
 
@@ -9,7 +9,7 @@ Coord = Tuple[int, int]          # (r, c)
 Val = Tuple[int, str]            # (number, color)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Given:
     r: int
     c: int
@@ -17,7 +17,7 @@ class Given:
     col: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Puzzle:
     rows: int
     cols: int
@@ -28,6 +28,51 @@ class Puzzle:
     givens: List[Given]                # fixed num and/or color
 
 
+def _neighbors4(r: int, c: int, R: int, C: int) -> List[Coord]:
+    out: List[Coord] = []
+    if r > 0: out.append((r - 1, c))
+    if r + 1 < R: out.append((r + 1, c))
+    if c > 0: out.append((r, c - 1))
+    if c + 1 < C: out.append((r, c + 1))
+    return out
+
+
+# Tables that depend only on the puzzle's shape are built once per shape
+# and shared by every solver over it (each solve()/count_solutions() call
+# and each UniquenessChecker builds a new one). They are read-only.
+@lru_cache(maxsize=None)
+def _grid_tables(R: int, C: int):
+    """(cells, row_of, col_of, nbrs) for the flat row-major layout i = r*C + c."""
+    cells = tuple((r, c) for r in range(R) for c in range(C))
+    row_of = tuple(r for (r, _) in cells)
+    col_of = tuple(c for (_, c) in cells)
+    nbrs = tuple(
+        tuple(nr * C + nc for nr, nc in _neighbors4(r, c, R, C)) for (r, c) in cells
+    )
+    return cells, row_of, col_of, nbrs
+
+
+@lru_cache(maxsize=None)
+def _value_tables(nums: Tuple[int, ...], pal: Tuple[str, ...]):
+    """
+    (vals, val_num, num_mask, col_mask, clash) for packed value codes
+    code = number_rank * K + color_index; `nums` ascending, `pal` deduplicated.
+    """
+    K = len(pal)
+    vals = tuple((n, col) for n in nums for col in pal)     # code -> (n,col)
+    val_num = tuple(n for (n, _) in vals)                   # code -> n
+    num_mask = {
+        n: sum(1 << (i * K + ci) for ci in range(K)) for i, n in enumerate(nums)
+    }
+    col_mask = {
+        col: sum(1 << (i * K + ci) for i in range(len(nums))) for ci, col in enumerate(pal)
+    }
+    # clash[v]: values a neighbor of a cell holding v cannot take
+    # (same color, different number)
+    clash = tuple(col_mask[col] & ~num_mask[n] for (n, col) in vals)
+    return vals, val_num, num_mask, col_mask, clash
+
+
 class NuminoSolver:
     """
     Numino Classic solver (square grid, sum clues).
@@ -46,348 +91,435 @@ class NuminoSolver:
 
         self.R = puzzle.rows
         self.C = puzzle.cols
-        self.cells: List[Coord] = [(r, c) for r in range(self.R) for c in range(self.C)]
-
-        # Domain per cell: set of (n,col)
-        self.dom: Dict[Coord, set[Val]] = {
-            (r, c): {(n, col) for n in puzzle.numbers for col in puzzle.palette}
-            for r in range(self.R) for c in range(self.C)
-        }
-
-        # Assignments: (r,c)->(n,col)
-        self.assign: Dict[Coord, Val] = {}
+        # Cells are flat row-major indices i = r*C + c; cells[i] is its (r,c),
+        # nbrs[i] the indices of its 4-neighbors
+        self.cells, self.row_of, self.col_of, self.nbrs = _grid_tables(self.R, self.C)
+
+        # Values are packed ints: code = number_rank * K + color_index, with
+        # numbers ascending, so in a domain bitmask the lowest set bit holds
+        # the smallest number and the highest set bit the largest.
+        (self.vals, self.val_num, self.num_mask, self.col_mask, self.clash) = _value_tables(
+            tuple(sorted(set(puzzle.numbers))),
+            tuple(dict.fromkeys(puzzle.palette)),
+        )
+        self.full_dom = (1 << len(self.vals)) - 1
+
+        # Domain per cell: bitmask over value codes
+        self.dom: List[int] = [self.full_dom] * len(self.cells)
+
+        # Assignments: cell -> value code, -1 while unassigned
+        self.assign: List[int] = [-1] * len(self.cells)
+        self.n_assigned = 0
 
         # Apply givens as domain restrictions
         for g in puzzle.givens:
-            rc = (g.r, g.c)
-            allowed = set(self.dom[rc])
-            if g.num is not None:
-                allowed = {(n, col) for (n, col) in allowed if n == g.num}
-            if g.col is not None:
-                allowed = {(n, col) for (n, col) in allowed if col == g.col}
-            self.dom[rc] = allowed
+            self.dom[self.index((g.r, g.c))] &= self.given_domain(g.num, g.col)
 
+        self.row_sums = puzzle.row_sums
+        self.col_sums = puzzle.col_sums
         self.row_sum_now = [0] * self.R
         self.col_sum_now = [0] * self.C
 
+        # Smallest/largest number each cell can still take, and their sums
+        # over the unassigned cells of every row and column. Kept current
+        # by set_dom and assign_val/unassign_val so bound checks never rescan.
+        self.cell_min: List[int] = [0] * len(self.cells)
+        self.cell_max: List[int] = [0] * len(self.cells)
+        self.row_min = [0] * self.R
+        self.row_max = [0] * self.R
+        self.col_min = [0] * self.C
+        self.col_max = [0] * self.C
+        # MRV buckets: by_size[k] is a bitmask of the unassigned cells whose
+        # domain holds k values; the lowest bit is the first such cell row-major
+        self.by_size: List[int] = [0] * (len(self.vals) + 1)
+        for i, (r, c) in enumerate(self.cells):
+            self.by_size[self.dom[i].bit_count()] |= 1 << i
+            mn, mx = self.num_bounds(self.dom[i])
+            self.cell_min[i] = mn
+            self.cell_max[i] = mx
+            self.row_min[r] += mn
+            self.row_max[r] += mx
+            self.col_min[c] += mn
+            self.col_max[c] += mx
+
     # ---------------- utilities ----------------
+    def index(self, rc: Coord) -> int:
+        """Flat cell index of (r,c)."""
+        return rc[0] * self.C + rc[1]
+
+    def given_domain(self, num: Optional[int], col: Optional[str]) -> int:
+        """Domain mask of a cell showing `num` and/or `col` (None = hidden)."""
+        mask = self.full_dom
+        if num is not None:
+            mask &= self.num_mask.get(num, 0)
+        if col is not None:
+            mask &= self.col_mask.get(col, 0)
+        return mask
+
     def neighbors4(self, r: int, c: int) -> List[Coord]:
-        out: List[Coord] = []
-        if r > 0: out.append((r - 1, c))
-        if r + 1 < self.R: out.append((r + 1, c))
-        if c > 0: out.append((r, c - 1))
-        if c + 1 < self.C: out.append((r, c + 1))
-        return out
+        return _neighbors4(r, c, self.R, self.C)
+
+    def min_num(self, d: int) -> int:
+        """Smallest number in non-empty domain `d` (lowest set bit)."""
+        return self.val_num[(d & -d).bit_length() - 1]
+
+    def max_num(self, d: int) -> int:
+        """Largest number in non-empty domain `d` (highest set bit)."""
+        return self.val_num[d.bit_length() - 1]
+
+    def num_bounds(self, d: int) -> Tuple[int, int]:
+        """(min, max) number in domain `d`; an empty domain gets bounds no sum can meet."""
+        if not d:
+            return (10**18, -10**18)
+        return self.min_num(d), self.max_num(d)
+
+    def set_dom(self, i: int, d: int) -> None:
+        """Replace the domain of cell `i`, keeping the row/col bound sums and MRV buckets in step."""
+        dom = self.dom
+        old = dom[i]
+        dom[i] = d
+        unassigned = self.assign[i] < 0
+        if unassigned:
+            by_size = self.by_size
+            bit = 1 << i
+            by_size[old.bit_count()] ^= bit
+            by_size[d.bit_count()] |= bit
+
+        if d:
+            val_num = self.val_num
+            mn = val_num[(d & -d).bit_length() - 1]
+            mx = val_num[d.bit_length() - 1]
+        else:
+            mn, mx = self.num_bounds(d)
+        cell_min = self.cell_min
+        cell_max = self.cell_max
+        dmin = mn - cell_min[i]
+        dmax = mx - cell_max[i]
+        if not (dmin or dmax):
+            return
+        cell_min[i] = mn
+        cell_max[i] = mx
+        if not unassigned:
+            return
+        r, c = self.row_of[i], self.col_of[i]
+        self.row_min[r] += dmin
+        self.row_max[r] += dmax
+        self.col_min[c] += dmin
+        self.col_max[c] += dmax
 
     def minmax_remaining_row(self, r: int) -> Tuple[int, int]:
-        min_add = 0
-        max_add = 0
-        for c in range(self.C):
-            rc = (r, c)
-            if rc in self.assign:
-                continue
-            d = self.dom[rc]
-            if not d:
-                return (10**18, -10**18)
-            nums = [n for (n, _) in d]
-            min_add += min(nums)
-            max_add += max(nums)
-        return min_add, max_add
+        return self.row_min[r], self.row_max[r]
 
     def minmax_remaining_col(self, c: int) -> Tuple[int, int]:
-        min_add = 0
-        max_add = 0
-        for r in range(self.R):
-            rc = (r, c)
-            if rc in self.assign:
-                continue
-            d = self.dom[rc]
-            if not d:
-                return (10**18, -10**18)
-            nums = [n for (n, _) in d]
-            min_add += min(nums)
-            max_add += max(nums)
-        return min_add, max_add
-
-    def sums_ok_local(self, rc: Coord, v: Val) -> bool:
-        r, c = rc
-        n, _ = v
+        return self.col_min[c], self.col_max[c]
+
+    def sums_ok_local(self, i: int, v: int) -> bool:
+        r, c = self.row_of[i], self.col_of[i]
+        n = self.val_num[v]
+        row_target = self.row_sums[r]
+        col_target = self.col_sums[c]
 
         rs = self.row_sum_now[r] + n
         cs = self.col_sum_now[c] + n
-        if rs > self.p.row_sums[r] or cs > self.p.col_sums[c]:
+        if rs > row_target or cs > col_target:
             return False
 
-        # Check row feasibility bounds after placing
-        min_add = 0
-        max_add = 0
-        for cc in range(self.C):
-            rc2 = (r, cc)
-            if rc2 == rc or rc2 in self.assign:
-                continue
-            d = self.dom[rc2]
-            if not d:
-                return False
-            nums = [nn for (nn, _) in d]
-            min_add += min(nums)
-            max_add += max(nums)
-        if rs + min_add > self.p.row_sums[r] or rs + max_add < self.p.row_sums[r]:
+        # Row/col feasibility bounds after placing: the sums over the
+        # remaining cells, minus cell i itself
+        mn = self.cell_min[i]
+        mx = self.cell_max[i]
+        if rs + self.row_min[r] - mn > row_target or rs + self.row_max[r] - mx < row_target:
             return False
-
-        # Check col feasibility bounds after placing
-        min_add = 0
-        max_add = 0
-        for rr in range(self.R):
-            rc3 = (rr, c)
-            if rc3 == rc or rc3 in self.assign:
-                continue
-            d = self.dom[rc3]
-            if not d:
-                return False
-            nums = [nn for (nn, _) in d]
-            min_add += min(nums)
-            max_add += max(nums)
-        if cs + min_add > self.p.col_sums[c] or cs + max_add < self.p.col_sums[c]:
+        if cs + self.col_min[c] - mn > col_target or cs + self.col_max[c] - mx < col_target:
             return False
 
         return True
 
-    def color_adjacency_ok(self, rc: Coord, v: Val) -> bool:
+    def color_adjacency_ok(self, i: int, v: int) -> bool:
         # If neighbor assigned with different number, colors must differ
-        r, c = rc
-        n, col = v
-        for nb in self.neighbors4(r, c):
-            if nb in self.assign:
-                n2, col2 = self.assign[nb]
-                if n2 != n and col2 == col:
-                    return False
+        clash = self.clash[v]
+        assign = self.assign
+        for nb in self.nbrs[i]:
+            a = assign[nb]
+            if a >= 0 and clash >> a & 1:
+                return False
         return True
 
-    def block_feasible(self, rc: Coord, v: Val) -> bool:
+    def block_feasible(self, i: int, v: int) -> bool:
         """
-        For the component containing rc with value v=(n,col):
+        For the component containing cell i with value v=(n,col):
         1) assigned connected size cannot exceed n
-        2) reachable capacity of cells that could be v from rc must be >= n
+        2) reachable capacity of cells that could be v from i must be >= n
+        Both searches stop as soon as the answer is known.
         """
-        r, c = rc
-        n, _ = v
-
-        # Count assigned same-value component adjacent to rc
-        assigned_same: set[Coord] = set()
-        q: deque[Coord] = deque()
-        seen: set[Coord] = set()
-
-        for nb in self.neighbors4(r, c):
-            if nb in self.assign and self.assign[nb] == v:
-                assigned_same.add(nb)
-                q.append(nb)
+        n = self.val_num[v]
+        assign = self.assign
+        dom = self.dom
+        nbrs = self.nbrs
+
+        # Grow the assigned same-value component adjacent to i
+        size = 1
+        seen = {i}
+        stack: List[int] = []
+        for nb in nbrs[i]:
+            if assign[nb] == v:
                 seen.add(nb)
-
-        while q:
-            cur = q.popleft()
-            rr, cc = cur
-            for nb in self.neighbors4(rr, cc):
-                if nb in seen:
-                    continue
-                if nb in self.assign and self.assign[nb] == v:
+                stack.append(nb)
+        while stack:
+            cur = stack.pop()
+            size += 1
+            if size > n:
+                return False
+            for nb in nbrs[cur]:
+                if nb not in seen and assign[nb] == v:
                     seen.add(nb)
-                    q.append(nb)
-                    assigned_same.add(nb)
-
-        if 1 + len(assigned_same) > n:
-            return False
-
-        # BFS reachable capacity: assigned same OR unassigned allowing v
-        def allows(xy: Coord) -> bool:
-            if xy in self.assign:
-                return self.assign[xy] == v
-            return v in self.dom[xy]
+                    stack.append(nb)
 
+        # Reachable capacity: assigned same OR unassigned allowing v
         reachable = 1
-        q = deque([rc])
-        visited = {rc}
-        while q:
-            cur = q.popleft()
-            rr, cc = cur
-            for nb in self.neighbors4(rr, cc):
+        if reachable >= n:
+            return True
+        stack = [i]
+        visited = {i}
+        while stack:
+            cur = stack.pop()
+            for nb in nbrs[cur]:
                 if nb in visited:
                     continue
-                if allows(nb):
-                    visited.add(nb)
-                    q.append(nb)
+                a = assign[nb]
+                if a == v if a >= 0 else dom[nb] >> v & 1:
                     reachable += 1
+                    if reachable >= n:
+                        return True
+                    visited.add(nb)
+                    stack.append(nb)
 
-        return reachable >= n
+        return False
+
+    def sealed_blocks_ok(self, i: int, v: int) -> bool:
+        """
+        After placing v at cell i: every assigned neighbor block with another
+        value lost i as a way to grow, so it must still be able to reach its
+        size. Blocks walled in short fail here instead of at a full grid.
+        """
+        assign = self.assign
+        for nb in self.nbrs[i]:
+            a = assign[nb]
+            if a >= 0 and a != v and not self.block_feasible(nb, a):
+                return False
+        return True
 
     # ---------------- backtracking core ----------------
-    def select_mrv(self) -> Coord:
-        best: Optional[Coord] = None
-        best_len = 10**18
-        for rc in self.cells:
-            if rc in self.assign:
-                continue
-            dlen = len(self.dom[rc])
-            if dlen < best_len:
-                best = rc
-                best_len = dlen
-                if dlen == 1:
-                    break
-        assert best is not None
-        return best
-
-    def order_values(self, rc: Coord) -> List[Val]:
-        vals = list(self.dom[rc])
+    def select_mrv(self) -> int:
+        # First unassigned cell (row-major) among those with the fewest values
+        for cells in self.by_size:
+            if cells:
+                return (cells & -cells).bit_length() - 1
+        raise AssertionError("no unassigned cell")
+
+    def order_values(self, i: int) -> List[int]:
+        vals: List[int] = []
+        d = self.dom[i]
+        while d:
+            low = d & -d
+            vals.append(low.bit_length() - 1)
+            d ^= low
+        if len(vals) < 2:
+            return vals
         self.rng.shuffle(vals)
 
-        # LCV-ish: prefer values that eliminate fewer neighbor options due to color rule
-        def impact(v: Val) -> int:
-            r, c = rc
-            n, col = v
+        # LCV-ish: prefer values that eliminate fewer neighbor options due to color rule.
+        # Neighbor domains are gathered once; each value then costs one AND per neighbor.
+        assign = self.assign
+        dom = self.dom
+        nb_doms = [dom[nb] for nb in self.nbrs[i] if assign[nb] < 0]
+        if not nb_doms:
+            return vals
+        clash = self.clash
+
+        def impact(v: int) -> int:
+            cv = clash[v]
             cnt = 0
-            for nb in self.neighbors4(r, c):
-                if nb in self.assign:
-                    continue
-                for (nn, cc) in self.dom[nb]:
-                    if nn != n and cc == col:
-                        cnt += 1
+            for nd in nb_doms:
+                cnt += (nd & cv).bit_count()
             return cnt
 
         vals.sort(key=impact)
         return vals
 
-    def assign_val(self, rc: Coord, v: Val) -> None:
-        self.assign[rc] = v
-        r, c = rc
-        self.row_sum_now[r] += v[0]
-        self.col_sum_now[c] += v[0]
-
-    def unassign_val(self, rc: Coord, v: Val) -> None:
-        del self.assign[rc]
-        r, c = rc
-        self.row_sum_now[r] -= v[0]
-        self.col_sum_now[c] -= v[0]
-
-    def forward_check_prune(self, rc: Coord, v: Val) -> List[Tuple[Coord, Val]]:
+    def assign_val(self, i: int, v: int) -> None:
+        self.assign[i] = v
+        self.n_assigned += 1
+        self.by_size[self.dom[i].bit_count()] ^= 1 << i
+        r, c = self.row_of[i], self.col_of[i]
+        n = self.val_num[v]
+        self.row_sum_now[r] += n
+        self.col_sum_now[c] += n
+        mn, mx = self.cell_min[i], self.cell_max[i]
+        self.row_min[r] -= mn
+        self.row_max[r] -= mx
+        self.col_min[c] -= mn
+        self.col_max[c] -= mx
+
+    def unassign_val(self, i: int, v: int) -> None:
+        self.assign[i] = -1
+        self.n_assigned -= 1
+        self.by_size[self.dom[i].bit_count()] |= 1 << i
+        r, c = self.row_of[i], self.col_of[i]
+        n = self.val_num[v]
+        self.row_sum_now[r] -= n
+        self.col_sum_now[c] -= n
+        mn, mx = self.cell_min[i], self.cell_max[i]
+        self.row_min[r] += mn
+        self.row_max[r] += mx
+        self.col_min[c] += mn
+        self.col_max[c] += mx
+
+    def forward_check_prune(self, i: int, v: int) -> List[Tuple[int, int]]:
         """
         Prune:
-        - lock rc to v
+        - lock cell i to v
         - in neighbors, remove values with same color but different number
-        Returns list of removed (cell, value) so we can undo.
+        Returns list of (cell, removed-values mask) so we can undo.
         """
-        r, c = rc
-        n, col = v
-        removed: List[Tuple[Coord, Val]] = []
+        removed: List[Tuple[int, int]] = []
+        dom = self.dom
+        assign = self.assign
+        set_dom = self.set_dom
 
-        # lock rc
-        for w in list(self.dom[rc]):
-            if w != v:
-                self.dom[rc].remove(w)
-                removed.append((rc, w))
+        # lock i
+        rest = dom[i] & ~(1 << v)
+        if rest:
+            set_dom(i, dom[i] ^ rest)
+            removed.append((i, rest))
 
         # prune neighbors
-        for nb in self.neighbors4(r, c):
-            if nb in self.assign:
+        clash = self.clash[v]
+        for nb in self.nbrs[i]:
+            if assign[nb] >= 0:
                 continue
-            to_remove: List[Val] = []
-            for (nn, cc) in self.dom[nb]:
-                if nn != n and cc == col:
-                    to_remove.append((nn, cc))
-            for w in to_remove:
-                if w in self.dom[nb]:
-                    self.dom[nb].remove(w)
-                    removed.append((nb, w))
+            rm = dom[nb] & clash
+            if rm:
+                set_dom(nb, dom[nb] ^ rm)
+                removed.append((nb, rm))
 
         return removed
 
-    def undo_prune(self, removed: List[Tuple[Coord, Val]]) -> None:
-        for rc, v in reversed(removed):
-            self.dom[rc].add(v)
+    def undo_prune(self, removed: List[Tuple[int, int]]) -> None:
+        dom = self.dom
+        set_dom = self.set_dom
+        for i, rm in reversed(removed):
+            set_dom(i, dom[i] | rm)
 
     def is_complete(self) -> bool:
-        return len(self.assign) == self.R * self.C
+        return self.n_assigned == len(self.cells)
 
     def sums_exact_ok(self) -> bool:
-        return self.row_sum_now == self.p.row_sums and self.col_sum_now == self.p.col_sums
+        return self.row_sum_now == self.row_sums and self.col_sum_now == self.col_sums
 
     def complete_blocks_ok(self) -> bool:
         # every connected region of identical (n,col) must have size == n
-        seen: set[Coord] = set()
-        for r in range(self.R):
-            for c in range(self.C):
-                rc = (r, c)
-                if rc in seen:
-                    continue
-                if rc not in self.assign:
-                    return False
-                v = self.assign[rc]
-                n, _ = v
-                q = deque([rc])
-                seen.add(rc)
-                comp: List[Coord] = [rc]
-                while q:
-                    rr, cc = q.popleft()
-                    for nb in self.neighbors4(rr, cc):
-                        if nb in seen:
-                            continue
-                        if nb in self.assign and self.assign[nb] == v:
-                            seen.add(nb)
-                            q.append(nb)
-                            comp.append(nb)
-                if len(comp) != n:
-                    return False
+        assign = self.assign
+        nbrs = self.nbrs
+        val_num = self.val_num
+        seen = bytearray(len(assign))
+        for i, v in enumerate(assign):
+            if seen[i]:
+                continue
+            if v < 0:
+                return False
+            n = val_num[v]
+            seen[i] = 1
+            stack = [i]
+            size = 1
+            while stack:
+                cur = stack.pop()
+                for nb in nbrs[cur]:
+                    if not seen[nb] and assign[nb] == v:
+                        seen[nb] = 1
+                        stack.append(nb)
+                        size += 1
+            if size != n:
+                return False
         return True
 
     def global_bounds_ok(self) -> bool:
-        for r in range(self.R):
-            mn, mx = self.minmax_remaining_row(r)
-            if self.row_sum_now[r] + mn > self.p.row_sums[r] or self.row_sum_now[r] + mx < self.p.row_sums[r]:
+        row_min, row_max = self.row_min, self.row_max
+        for r, (now, target) in enumerate(zip(self.row_sum_now, self.row_sums)):
+            if now + row_min[r] > target or now + row_max[r] < target:
                 return False
-        for c in range(self.C):
-            mn, mx = self.minmax_remaining_col(c)
-            if self.col_sum_now[c] + mn > self.p.col_sums[c] or self.col_sum_now[c] + mx < self.p.col_sums[c]:
+        col_min, col_max = self.col_min, self.col_max
+        for c, (now, target) in enumerate(zip(self.col_sum_now, self.col_sums)):
+            if now + col_min[c] > target or now + col_max[c] < target:
                 return False
         return True
 
-    def solve(self, find_two: bool = False, max_solutions: int = 2) -> List[Dict[Coord, Val]]:
-        solutions: List[Dict[Coord, Val]] = []
-
-        def dfs() -> bool:
-            if not self.global_bounds_ok():
-                return False
-
-            if self.is_complete():
+    def _search(self, limit: int, out: Optional[List[Dict[Coord, Val]]]) -> int:
+        """
+        Backtrack until `limit` solutions are found or the space is exhausted.
+        Returns how many were found; they are only materialized into `out`
+        when it is given.
+        """
+        found = 0
+        # Bound once: the recursion below runs these at every node
+        global_bounds_ok = self.global_bounds_ok
+        select_mrv = self.select_mrv
+        order_values = self.order_values
+        sums_ok_local = self.sums_ok_local
+        color_adjacency_ok = self.color_adjacency_ok
+        block_feasible = self.block_feasible
+        sealed_blocks_ok = self.sealed_blocks_ok
+        assign_val = self.assign_val
+        unassign_val = self.unassign_val
+        forward_check_prune = self.forward_check_prune
+        undo_prune = self.undo_prune
+        n_cells = len(self.cells)
+
+        def dfs() -> None:
+            nonlocal found
+            if not global_bounds_ok():
+                return
+
+            if self.n_assigned == n_cells:
                 if self.sums_exact_ok() and self.complete_blocks_ok():
-                    solutions.append(dict(self.assign))
-                    return True
-                return False
-
-            rc = self.select_mrv()
-            for v in self.order_values(rc):
-                if not self.sums_ok_local(rc, v):
+                    found += 1
+                    if out is not None:
+                        out.append({rc: self.vals[v] for rc, v in zip(self.cells, self.assign)})
+                return
+
+            i = select_mrv()
+            for v in order_values(i):
+                if not sums_ok_local(i, v):
                     continue
-                if not self.color_adjacency_ok(rc, v):
+                if not color_adjacency_ok(i, v):
                     continue
-                if not self.block_feasible(rc, v):
+                if not block_feasible(i, v):
                     continue
 
-                self.assign_val(rc, v)
-                removed = self.forward_check_prune(rc, v)
-
-                ok = dfs()
+                assign_val(i, v)
+                removed = forward_check_prune(i, v)
 
-                self.undo_prune(removed)
-                self.unassign_val(rc, v)
+                if sealed_blocks_ok(i, v):
+                    dfs()
 
-                if ok and not find_two:
-                    return True
-                if find_two and len(solutions) >= max_solutions:
-                    return True
+                undo_prune(removed)
+                unassign_val(i, v)
 
-            return False
+                if found >= limit:
+                    return
 
         dfs()
+        return found
+
+    def solve(self, find_two: bool = False, max_solutions: int = 2) -> List[Dict[Coord, Val]]:
+        solutions: List[Dict[Coord, Val]] = []
+        self._search(max_solutions if find_two else 1, solutions)
         return solutions
 
+    def count(self, limit: int = 2) -> int:
+        """Number of solutions, stopping at `limit`; no solution grids are built."""
+        return self._search(limit, None)
+
 
 # -------- public helper functions --------
 def solve(puzzle: Puzzle, seed: Optional[int] = None) -> Optional[Dict[Coord, Val]]:
@@ -398,8 +530,60 @@ def solve(puzzle: Puzzle, seed: Optional[int] = None) -> Optional[Dict[Coord, Va
 
 def count_solutions(puzzle: Puzzle, limit: int = 2, seed: Optional[int] = None) -> int:
     s = NuminoSolver(puzzle, seed=seed)
-    sols = s.solve(find_two=True, max_solutions=limit)
-    return len(sols)
+    return s.count(limit)
+
+
+class UniquenessChecker:
+    """
+    Incremental uniqueness oracle for a puzzle whose solution is known.
+
+    Keeps one solver alive and only touches the domain of the cell whose
+    clue changed. Relies on the invariant that the current givens have
+    exactly one solution (`solution`): after hiding one attribute at
+    (r,c), any other solution must disagree with that attribute, so the
+    search is seeded with (r,c) restricted to the other values.
+    """
+
+    def __init__(self, puzzle: Puzzle, solution: Dict[Coord, Val], seed: Optional[int] = None):
+        self.solution = solution
+        self.solver = NuminoSolver(puzzle, seed=seed)
+
+    def set_cell(self, rc: Coord, show_num: bool, show_col: bool) -> int:
+        """Re-derive the domain of `rc` from its mask; returns the old domain."""
+        n, col = self.solution[rc]
+        i = self.solver.index(rc)
+        saved = self.solver.dom[i]
+        self.solver.set_dom(i, self.solver.given_domain(
+            n if show_num else None,
+            col if show_col else None,
+        ))
+        return saved
+
+    def restore_cell(self, rc: Coord, saved: int) -> None:
+        self.solver.set_dom(self.solver.index(rc), saved)
+
+    def is_unique(self) -> bool:
+        """Full check of the current domains, with no seeded cell: exactly one solution."""
+        return self.solver.count(2) == 1
+
+    def has_second_solution(self, last_changed: Coord, part: str) -> bool:
+        """True if hiding `part` ("num" | "col") at `last_changed` broke uniqueness."""
+        n, col = self.solution[last_changed]
+        solver = self.solver
+        i = solver.index(last_changed)
+        saved = solver.dom[i]
+        if part == "num":
+            others = saved & ~solver.num_mask[n]
+        else:
+            others = saved & ~solver.col_mask[col]
+        if not others:
+            return False
+
+        solver.set_dom(i, others)
+        try:
+            return solver.count(1) > 0
+        finally:
+            solver.set_dom(i, saved)
 
 
 def solution_to_grid(rows: int, cols: int, sol: Dict[Coord, Val]) -> List[List[Val]]: